@@ -7,8 +7,21 @@ from .seed_generator_min import NODE_CLASS_MAPPINGS as MAP3, NODE_DISPLAY_NAME_M
 from .resize_by_scale import NODE_CLASS_MAPPINGS as MAP4, NODE_DISPLAY_NAME_MAPPINGS as NAME4
 from .dynamic_text_concatenate import NODE_CLASS_MAPPINGS as MAP5, NODE_DISPLAY_NAME_MAPPINGS as NAME5
 
-# 모든 딕셔너리 병합 (MAP1 ~ MAP5)
-NODE_CLASS_MAPPINGS = {**MAP1, **MAP2, **MAP3, **MAP4, **MAP5}
-NODE_DISPLAY_NAME_MAPPINGS = {**NAME1, **NAME2, **NAME3, **NAME4, **NAME5}
+# 배치 노드
+from .seed_wildcard_batch import NODE_CLASS_MAPPINGS as MAP6, NODE_DISPLAY_NAME_MAPPINGS as NAME6
+
+# 검사 노드
+from .seed_wildcard_validate import NODE_CLASS_MAPPINGS as MAP7, NODE_DISPLAY_NAME_MAPPINGS as NAME7
+
+# 전체 조합 나열 노드
+from .seed_wildcard_enumerate import NODE_CLASS_MAPPINGS as MAP8, NODE_DISPLAY_NAME_MAPPINGS as NAME8
+
+# 모든 딕셔너리 병합 (MAP1 ~ MAP8)
+NODE_CLASS_MAPPINGS = {**MAP1, **MAP2, **MAP3, **MAP4, **MAP5, **MAP6, **MAP7, **MAP8}
+NODE_DISPLAY_NAME_MAPPINGS = {**NAME1, **NAME2, **NAME3, **NAME4, **NAME5, **NAME6, **NAME7, **NAME8}
+
+# 계측 스냅샷 엔드포인트 (ComfyUI 서버 안에서 로드된 경우에만 등록)
+from .instrumentation import register_routes
+register_routes()
 
 __all__ = ['NODE_CLASS_MAPPINGS', 'NODE_DISPLAY_NAME_MAPPINGS']
\ No newline at end of file
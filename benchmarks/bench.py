@@ -0,0 +1,224 @@
+"""
+ComfyUI 없이 실행하는 벤치마크.
+
+    python benchmarks/bench.py --files 200 --lines 500 --depth 3 --fanout 2 --out bench_output.txt
+
+folder_paths 를 스텁으로 대체하고 임시 폴더에 합성 와일드카드 트리와 Lora 목록을 만든 뒤,
+주요 경로(SeedBasedWildcardImpact.process, SeedBasedWildcardLora.process / extract_loras,
+ResizeByScale.resize)의 시간을 측정해 JSON 으로 출력합니다.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def install_folder_paths_stub(base_path, loras):
+    stub = types.ModuleType("folder_paths")
+    stub.base_path = base_path
+    stub.get_filename_list = lambda kind: list(loras) if kind == "loras" else []
+    sys.modules["folder_paths"] = stub
+    return stub
+
+
+def load_package(name="seed_wildcard_pack"):
+    # 폴더 이름에 '-' 가 있어 일반 import 가 안 되므로 경로로 로드
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_loras(count, rng):
+    return [f"{rng.choice(['chars', 'styles', 'concepts'])}/lora_{i:05d}-v{i % 4}.safetensors"
+            for i in range(count)]
+
+
+def make_wildcard_tree(wildcard_dir, files, lines, depth, fanout, choices, loras, rng):
+    """
+    depth 단계의 합성 트리. level k 의 줄은 level k+1 파일을 fanout 개 참조하고,
+    {a|b|w::c} 그룹과 <lora:...> 태그를 섞어 둡니다. 진입 파일은 main.txt.
+    """
+    per_level = max(1, files // max(depth, 1))
+    levels = []
+    for level in range(depth):
+        folder = os.path.join(wildcard_dir, f"level{level}")
+        os.makedirs(folder, exist_ok=True)
+        levels.append([(folder, f"l{level}_f{i}") for i in range(per_level)])
+
+    def make_line(level, i):
+        parts = [f"word{level}_{i}"]
+        if choices:
+            options = "|".join(f"{rng.randint(1, 5)}::opt{j}" if j % 2 else f"opt{j}" for j in range(choices))
+            parts.append("{" + options + "}")
+        if level + 1 < depth:
+            for _ in range(fanout):
+                parts.append("__" + rng.choice(levels[level + 1])[1] + "__")
+        if loras and rng.random() < 0.2:
+            name = os.path.splitext(rng.choice(loras))[0]
+            parts.append(f"<lora:{name}:{rng.uniform(0.2, 1.0):.2f}>")
+        return ", ".join(parts)
+
+    for level, entries in enumerate(levels):
+        for folder, tag in entries:
+            with open(os.path.join(folder, tag + ".txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(make_line(level, i) for i in range(lines)))
+
+    with open(os.path.join(wildcard_dir, "main.txt"), "w", encoding="utf-8") as f:
+        top = levels[0] if levels else []
+        f.write("\n".join(f"main {i}, __{rng.choice(top)[1]}__" if top else f"main {i}" for i in range(lines)))
+
+
+def make_weighted_files(wildcard_dir, rng, subjects=5000, options=300):
+    """태그로 삽입되는 큰 가중치 그룹: weighted.txt = '__bench_subj__, __bench_style__'."""
+    with open(os.path.join(wildcard_dir, "bench_subj.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(f"subject {i} {{red|blue|green}} hair" if i % 3 == 0 else f"subject {i}"
+                          for i in range(subjects)))
+    with open(os.path.join(wildcard_dir, "bench_style.txt"), "w", encoding="utf-8") as f:
+        f.write("{" + "|".join(f"{rng.randint(1, 9)}::style{i}" for i in range(options)) + "}")
+    with open(os.path.join(wildcard_dir, "weighted.txt"), "w", encoding="utf-8") as f:
+        f.write("__bench_subj__, __bench_style__")
+
+
+def timeit(func, iterations, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(iterations):
+            func(i)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def record(results, name, iterations, elapsed, **extra):
+    entry = {
+        "name": name,
+        "iterations": iterations,
+        "best_total_s": round(elapsed, 6),
+        "per_call_us": round(elapsed / iterations * 1e6, 3),
+    }
+    entry.update(extra)
+    results.append(entry)
+    print(f"{name:<40} {entry['per_call_us']:>12.1f} us/call", file=sys.stderr)
+
+
+def bench_wildcards(pack, results, seeds, repeat):
+    impact = pack.NODE_CLASS_MAPPINGS["SeedBasedWildcardImpact"]()
+    lora = pack.NODE_CLASS_MAPPINGS["SeedBasedWildcardLora"]()
+    # 반복 측정이 결과 캐시 hit 만 재지 않도록 해석 경로는 캐시 없이 측정
+    result_cache = pack.result_cache.result_cache
+    maxsize = result_cache.maxsize
+    result_cache.maxsize = 0
+
+    # 첫 호출(콜드) 은 캐시/인덱스 생성 비용 포함
+    start = time.perf_counter()
+    impact.process("main.txt", 1)
+    record(results, "impact.process.cold", 1, time.perf_counter() - start)
+
+    record(results, "impact.process", seeds,
+           timeit(lambda i: impact.process("main.txt", i + 1), seeds, repeat))
+    record(results, "lora.process", seeds,
+           timeit(lambda i: lora.process(None, None, "main.txt", i + 1), seeds, repeat))
+    for sampling in ("compatible", "alias"):
+        record(results, f"impact.weighted.{sampling}", seeds,
+               timeit(lambda i: impact.process("weighted.txt", i + 1, sampling), seeds, repeat))
+    result_cache.maxsize = maxsize
+    result_cache.clear()
+    record(results, "impact.process.memoized", seeds,
+           timeit(lambda i: impact.process("main.txt", i + 1), seeds, repeat))
+    record(results, "impact.INPUT_TYPES", 100,
+           timeit(lambda i: impact.INPUT_TYPES(), 100, repeat))
+
+    texts = [impact.process("main.txt", i + 1)[0] for i in range(min(seeds, 1000))]
+    record(results, "lora.extract_loras", len(texts),
+           timeit(lambda i: lora.extract_loras(texts[i]), len(texts), repeat))
+    # 해석된 문자열별 캐시를 거치지 않은 토크나이저 자체 비용
+    tokenize = pack.lora_tags.tokenize_lora_tags.__wrapped__
+    record(results, "lora.tokenize.uncached", len(texts),
+           timeit(lambda i: tokenize(texts[i]), len(texts), repeat))
+
+
+def bench_resize(pack, results, batch_sizes, size, repeat):
+    try:
+        import torch
+        import cv2  # noqa: F401
+    except ImportError as e:
+        results.append({"name": "resize", "skipped": f"missing dependency: {e.name}"})
+        print(f"resize skipped (missing {e.name})", file=sys.stderr)
+        return
+
+    node = pack.NODE_CLASS_MAPPINGS["ResizeByScale"]()
+    for backend in ("opencv", "torch"):
+        for batch in batch_sizes:
+            image = torch.rand((batch, size, size, 3), dtype=torch.float32)
+            elapsed = timeit(lambda i: node.resize(image, "Lanczos", size, size, 1.5, True, backend), 1, repeat)
+            record(results, f"resize.{backend}.b{batch}", batch, elapsed, batch=batch, size=size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Seed Wildcard Pack hot paths.")
+    parser.add_argument("--files", type=int, default=200, help="number of wildcard files")
+    parser.add_argument("--lines", type=int, default=500, help="lines per file")
+    parser.add_argument("--depth", type=int, default=3, help="tag nesting depth")
+    parser.add_argument("--fanout", type=int, default=2, help="tag references per line")
+    parser.add_argument("--choices", type=int, default=4, help="options per {a|b} group (0 = none)")
+    parser.add_argument("--loras", type=int, default=3000, help="synthetic LoRA list size")
+    parser.add_argument("--seeds", type=int, default=2000, help="seeds per wildcard benchmark")
+    parser.add_argument("--batch-sizes", default="1,8,64", help="ResizeByScale batch sizes")
+    parser.add_argument("--image-size", type=int, default=256, help="ResizeByScale input size")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats (best time is reported)")
+    parser.add_argument("--skip-resize", action="store_true")
+    parser.add_argument("--rng-seed", type=int, default=0)
+    parser.add_argument("--out", default="-", help="JSON output path ('-' = stdout)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.rng_seed)
+    base_path = tempfile.mkdtemp(prefix="seed_wildcard_bench_")
+    try:
+        wildcard_dir = os.path.join(base_path, "custom_nodes", "ComfyUI-Impact-Pack", "wildcards")
+        os.makedirs(wildcard_dir)
+        loras = make_loras(args.loras, rng)
+        make_wildcard_tree(wildcard_dir, args.files, args.lines, args.depth, args.fanout,
+                           args.choices, loras, rng)
+        make_weighted_files(wildcard_dir, rng)
+        install_folder_paths_stub(base_path, loras)
+        pack = load_package()
+
+        results = []
+        bench_wildcards(pack, results, args.seeds, args.repeat)
+        if not args.skip_resize:
+            batch_sizes = [int(b) for b in args.batch_sizes.split(",") if b.strip()]
+            bench_resize(pack, results, batch_sizes, args.image_size, args.repeat)
+    finally:
+        shutil.rmtree(base_path, ignore_errors=True)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": vars(args),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
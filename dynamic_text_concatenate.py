@@ -1,13 +1,17 @@
+from .instrumentation import instrumented
+
+NUM_SLOTS = 10
+
+
 class DynamicTextConcatenate:
     @classmethod
     def INPUT_TYPES(cls):
-        num_slots = 10
         base_inputs = {
             "required": {
                 "num_inputs": ("INT", {
                     "default": 2,
                     "min": 2,
-                    "max": num_slots
+                    "max": NUM_SLOTS
                 }),
                 "delimiter": ("STRING", {
                     "default": "",
@@ -17,7 +21,7 @@ class DynamicTextConcatenate:
         }
 
         dynamic_inputs = {
-            f"text_{i}": ("STRING",) for i in range(1, num_slots + 1)
+            f"text_{i}": ("STRING",) for i in range(1, NUM_SLOTS + 1)
         }
 
         return {**base_inputs, "optional": dynamic_inputs}
@@ -27,6 +31,7 @@ class DynamicTextConcatenate:
     FUNCTION = "concatenate"
     CATEGORY = "Custom/Text"
 
+    @instrumented("DynamicTextConcatenate")
     def concatenate(self, num_inputs=2, delimiter="", **kwargs):
         texts = []
         for i in range(1, num_inputs + 1):
@@ -36,10 +41,76 @@ class DynamicTextConcatenate:
         return (result,)
 
 
+class DynamicTextConcatenateList:
+    """
+    리스트 입력(INPUT_IS_LIST)을 받는 DynamicTextConcatenate.
+    - zip: i 번째 요소끼리 한 줄로 합침. 길이 1 인 입력은 모든 줄에 반복, 짧은 입력의 빈 자리는 "" 로 처리
+    - flatten: 모든 입력의 모든 요소를 순서대로 하나의 텍스트로 합침
+    각 줄은 join 한 번으로 만들어지므로 10k 프롬프트 배치도 노드 한 번 실행에 선형 비용입니다.
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        inputs = DynamicTextConcatenate.INPUT_TYPES()
+        inputs["required"].update({
+            "mode": (["zip", "flatten"], {"default": "zip"}),
+            # 빈 문자열 조각은 구분자 없이 건너뜀
+            "skip_empty": ("BOOLEAN", {"default": True}),
+            # 한 줄 안에서 같은 조각이 반복되면 처음 것만 남김
+            "dedup": ("BOOLEAN", {"default": False}),
+            # joined_text 에서 줄 사이에 넣을 구분자 ("\n" 처럼 이스케이프 입력 허용)
+            "row_delimiter": ("STRING", {"default": "\\n", "multiline": False}),
+        })
+        return inputs
+
+    INPUT_IS_LIST = True
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("texts", "joined_text")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "concatenate"
+    CATEGORY = "Custom/Text"
+
+    @instrumented("DynamicTextConcatenateList")
+    def concatenate(self, num_inputs=(2,), delimiter=("",), mode=("zip",), skip_empty=(True,), dedup=(False,),
+                    row_delimiter=("\\n",), **kwargs):
+        # INPUT_IS_LIST 이므로 위젯 값도 리스트로 들어옴
+        num_inputs, delimiter, mode = num_inputs[0], delimiter[0], mode[0]
+        skip_empty, dedup, row_delimiter = skip_empty[0], dedup[0], row_delimiter[0]
+        columns = [kwargs.get(f"text_{i}") or [] for i in range(1, num_inputs + 1)]
+
+        if mode == "flatten":
+            rows = [[text for column in columns for text in column]]
+        else:
+            rows = self.zip_rows(columns)
+
+        texts = [delimiter.join(self.clean_parts(parts, skip_empty, dedup)) for parts in rows]
+        row_delimiter = row_delimiter.replace("\\n", "\n").replace("\\t", "\t")
+        return (texts, row_delimiter.join(texts))
+
+    @staticmethod
+    def zip_rows(columns):
+        length = max((len(column) for column in columns), default=0)
+        # 길이 1 은 모든 줄에 반복, 그 외 짧은 입력은 "" 로 채움
+        padded = [column * length if len(column) == 1 else list(column) + [""] * (length - len(column))
+                  for column in columns]
+        return zip(*padded)
+
+    @staticmethod
+    def clean_parts(parts, skip_empty, dedup):
+        parts = ["" if part is None else part for part in parts]
+        if skip_empty:
+            parts = [part for part in parts if part]
+        if dedup:
+            parts = list(dict.fromkeys(parts))
+        return parts
+
+
 NODE_CLASS_MAPPINGS = {
-    "DynamicTextConcatenate": DynamicTextConcatenate
+    "DynamicTextConcatenate": DynamicTextConcatenate,
+    "DynamicTextConcatenateList": DynamicTextConcatenateList
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
-    "DynamicTextConcatenate": "🔗 Dynamic Text Concatenate"
+    "DynamicTextConcatenate": "🔗 Dynamic Text Concatenate",
+    "DynamicTextConcatenateList": "🔗 Dynamic Text Concatenate (List)"
 }
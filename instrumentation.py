@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("SeedWildcardPack")
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class Metrics:
+    """
+    선택적(opt-in) 계측. 비활성 상태에서는 phase() 가 공유 nullcontext 를 돌려주고
+    나머지 메서드는 호출 측에서 `if metrics.enabled:` 로 건너뛰므로 비용이 거의 없습니다.
+    - timings: 구간 이름 -> 호출 수 / 누적 / 최대 시간(초)
+    - counters: 캐시 hit/miss, 읽은 파일 수/바이트 등 누적 값
+    - gauges: 최대 재귀 깊이 등 최댓값
+    활성화: 환경변수 SEED_WILDCARD_METRICS=1 또는 metrics.enable()
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+        self._gauges = {}
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def add_timing(self, name, seconds):
+        with self._lock:
+            entry = self._timings.get(name)
+            if entry is None:
+                self._timings[name] = [1, seconds, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+                if seconds > entry[2]:
+                    entry[2] = seconds
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe_max(self, name, value):
+        with self._lock:
+            if value > self._gauges.get(name, value - 1):
+                self._gauges[name] = value
+
+    @contextlib.contextmanager
+    def _node_run(self, node):
+        with self._lock:
+            before = dict(self._counters)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add_timing(f"{node}.total", elapsed)
+            with self._lock:
+                delta = {key: value - before.get(key, 0)
+                         for key, value in self._counters.items() if value != before.get(key, 0)}
+            # 큐 항목 하나에 대한 구조화 로그 (JSON 한 줄)
+            logger.info(json.dumps({"node": node, "seconds": round(elapsed, 6), "counters": delta}))
+
+    def node_run(self, node):
+        """노드 한 번의 실행을 감싸 전체 시간과 그 동안의 카운터 변화를 로그로 남깁니다."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._node_run(node)
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            data = {
+                "enabled": self.enabled,
+                "timings": {
+                    name: {"count": count, "total_s": total, "max_s": max_s,
+                           "avg_s": total / count if count else 0.0}
+                    for name, (count, total, max_s) in self._timings.items()
+                },
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+            if reset:
+                self._timings.clear()
+                self._counters.clear()
+                self._gauges.clear()
+        return data
+
+    def reset(self):
+        self.snapshot(reset=True)
+
+
+metrics = Metrics(os.environ.get("SEED_WILDCARD_METRICS", "").lower() in ("1", "true", "yes", "on"))
+
+
+def register_routes():
+    """
+    ComfyUI 서버가 있으면 GET /seed_wildcard/metrics 로 스냅샷을 노출하고,
+    POST /seed_wildcard/unique/reset 으로 세션 중복 필터를, POST /seed_wildcard/rescan 으로 폴더 인덱스를
+    초기화할 수 있게 합니다.
+    """
+    try:
+        from aiohttp import web
+        from server import PromptServer
+    except ImportError:
+        return False
+    if getattr(PromptServer, "instance", None) is None:
+        return False
+
+    from .wildcard_index import rescan
+    from .wildcard_unique import reset_sessions
+
+    @PromptServer.instance.routes.get("/seed_wildcard/metrics")
+    async def get_metrics(request):
+        reset = request.query.get("reset", "").lower() in ("1", "true", "yes")
+        return web.json_response(metrics.snapshot(reset=reset))
+
+    @PromptServer.instance.routes.post("/seed_wildcard/unique/reset")
+    async def reset_unique(request):
+        # unique=session 노드들이 기억하는 이전 프롬프트를 모두 잊음
+        return web.json_response({"cleared": reset_sessions()})
+
+    @PromptServer.instance.routes.post("/seed_wildcard/rescan")
+    async def rescan_wildcards(request):
+        # 폴더 mtime 이 바뀌지 않는 변경(일부 네트워크 드라이브 등)을 반영하도록 wildcards 폴더를 전부 다시 읽음
+        index = await asyncio.get_running_loop().run_in_executor(None, rescan)
+        return web.json_response({"files": len(index.files), "generation": index.generation})
+
+    return True
+
+
+def instrumented(node):
+    """노드의 FUNCTION 메서드에 붙이는 데코레이터. 비활성 상태면 원래 함수를 바로 호출합니다."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.node_run(node):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,149 @@
+import functools
+import re
+
+from .instrumentation import logger, metrics
+
+# <lora:name[:unet[:te]]> 와 LyCORIS 확장의 <lyco:...> 를 같은 규칙으로 처리
+LORA_PATTERN = re.compile(r"<(?:lora|lyco):([^>]+)>")
+
+TOKENIZE_CACHE_SIZE = 4096
+
+
+def _parse_strength(value, default):
+    if not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _parse_tag(body):
+    """'name:unet:te' -> (이름, model_strength, clip_strength). 이름이 비어 있으면 None."""
+    parts = body.split(':')
+    raw_name = parts[0].strip()
+    if not raw_name:
+        return None
+    model_strength = clip_strength = 1.0
+    if len(parts) > 1:
+        model_strength = clip_strength = _parse_strength(parts[1], 1.0)
+    if len(parts) > 2:
+        clip_strength = _parse_strength(parts[2], clip_strength)
+    return raw_name, model_strength, clip_strength
+
+
+@functools.lru_cache(maxsize=TOKENIZE_CACHE_SIZE)
+def tokenize_lora_tags(text):
+    """
+    텍스트를 한 번 나눠 ((이름, model_strength, clip_strength), ...) 와 태그가 제거된 텍스트를 함께 반환합니다.
+    Lora 파일 목록과 무관하므로 해석된 문자열마다 한 번만 계산해 캐시합니다.
+    """
+    # split 한 번으로 [텍스트, 태그 본문, 텍스트, 태그 본문, ..., 텍스트] 를 얻음
+    pieces = LORA_PATTERN.split(text)
+    tags = tuple(tag for tag in map(_parse_tag, pieces[1::2]) if tag is not None)
+    # 태그를 지운 뒤 연속 공백을 하나로 (re.sub(r'\s+', ' ', ...).strip() 과 같은 결과)
+    clean_text = " ".join("".join(pieces[0::2]).split())
+    return tags, clean_text
+
+
+def parse_lora_tags(text, available_loras, warn=True):
+    """
+    텍스트에서 <lora:name:strength[:clip_strength]> (또는 <lyco:...>) 구문을 추출합니다.
+    available_loras(ComfyUI Lora 파일 목록)와 대조해 정식 파일명으로 바꾸고,
+    (lora_stack, 구문이 제거된 텍스트) 를 반환합니다.
+    """
+    tags, clean_text = tokenize_lora_tags(text)
+    if not tags:
+        return [], clean_text
+
+    lora_index = get_lora_index(available_loras)
+    lora_stack = []
+    for raw_lora_name, model_strength, clip_strength in tags:
+        # [핵심] 사용자가 입력한 이름(raw_name)을 시스템의 정식 명칭(real_name)으로 변환
+        real_lora_name = lora_index.find(raw_lora_name)
+
+        # 매칭에 실패했더라도 일단 원본 이름을 사용 (단, 경고 출력)
+        if real_lora_name is None:
+            if metrics.enabled:
+                metrics.incr("lora.unmatched")
+            if warn:
+                logger.warning("[SeedWildcardLora] Could not find strict match for Lora '%s'. Trying raw name.",
+                               raw_lora_name)
+            real_lora_name = raw_lora_name
+
+        lora_stack.append((real_lora_name, model_strength, clip_strength))
+
+    return lora_stack, clean_text
+
+
+def normalize_lora_name(name):
+    """비교용 정규화 (소문자, 역슬래시->슬래시, .safetensors/.pt 확장자 제거)"""
+    normalized = name.replace("\\", "/").lower()
+    if normalized.endswith(".safetensors"):
+        normalized = normalized[:-12]
+    elif normalized.endswith(".pt"):
+        normalized = normalized[:-3]
+    return normalized
+
+
+def _compact_key(normalized):
+    # 퍼지 매칭용 키: 폴더를 떼고 영숫자만 남김 ("my_lora-v2" -> "mylorav2")
+    basename = normalized.rsplit("/", 1)[-1]
+    return "".join(ch for ch in basename if ch.isalnum())
+
+
+class LoraNameIndex:
+    """
+    Lora 파일 목록을 한 번만 정규화해 둔 조회 테이블.
+    1) 정규화된 전체 경로  2) 파일명만  3) 영숫자만 남긴 파일명(퍼지) 순서로 찾습니다.
+    2), 3) 에서 여러 파일이 겹치면 잘못된 Lora 를 고르지 않도록 매칭하지 않습니다.
+    """
+
+    def __init__(self, available_list):
+        self.available = list(available_list)
+        self.exact = {}
+        basenames = {}
+        compacts = {}
+        for filename in self.available:
+            normalized = normalize_lora_name(filename)
+            # 기존 선형 탐색과 같이 목록에서 먼저 나온 파일이 우선
+            self.exact.setdefault(normalized, filename)
+            basename = normalized.rsplit("/", 1)[-1]
+            basenames.setdefault(basename, set()).add(filename)
+            compacts.setdefault(_compact_key(normalized), set()).add(filename)
+        self.basename = {key: next(iter(names)) for key, names in basenames.items() if len(names) == 1}
+        self.fuzzy = {key: next(iter(names)) for key, names in compacts.items() if key and len(names) == 1}
+
+    def find(self, input_name):
+        normalized = normalize_lora_name(input_name)
+        found = self.exact.get(normalized)
+        if found is not None:
+            return found
+        found = self.basename.get(normalized.rsplit("/", 1)[-1])
+        if found is not None:
+            return found
+        return self.fuzzy.get(_compact_key(normalized))
+
+
+_lora_index = None
+
+
+def get_lora_index(available_list):
+    """목록이 이전 호출과 같으면 기존 인덱스를 재사용하고, 바뀌었을 때만 다시 만듭니다."""
+    global _lora_index
+    if not isinstance(available_list, list):
+        available_list = list(available_list)
+    index = _lora_index
+    if index is None or index.available != available_list:
+        with metrics.phase("lora.index_build"):
+            index = _lora_index = LoraNameIndex(available_list)
+    return index
+
+
+def find_best_match_lora(input_name, available_list):
+    """
+    사용자 입력(input_name)과 ComfyUI 파일 목록(available_list)을 비교하여
+    가장 적절한 실제 파일명을 반환합니다. 못 찾으면 None.
+    역슬래시(\\)와 슬래시(/), 확장자 유무를 자동으로 보정합니다.
+    """
+    return get_lora_index(available_list).find(input_name)
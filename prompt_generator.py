@@ -0,0 +1,301 @@
+"""
+ComfyUI 없이 SeedBasedWildcardLora 와 같은 규칙(공유 엔진 wildcard_engine)으로 대량의 프롬프트/LoRA 스택을 생성하는 headless 도구.
+
+    python prompt_generator.py --wildcards <wildcards 폴더> --file characters.txt \
+        --start 1 --count 1000000 --workers 8 --loras-dir <models/loras> --out prompts.jsonl \
+        [--tag-rules exact|impact] [--unique]
+
+시드 범위를 shard 로 나눠 ProcessPoolExecutor 로 병렬 처리하고, 결과는 시드 순서대로 기록합니다.
+각 워커는 시작할 때 한 번만 와일드카드 인덱스를 만들고 파일 캐시/컴파일된 템플릿을 재사용합니다.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_package(name="seed_wildcard_pack"):
+    """
+    스크립트로 실행할 때 이 폴더를 패키지로 경로 로드합니다 (폴더 이름에 '-' 가 있어 일반 import 가 안 됨).
+    __init__.py 는 실행하지 않으므로 ComfyUI(folder_paths, 서버) 없이 엔진 모듈만 불러옵니다.
+    """
+    package = sys.modules.get(name)
+    if package is None:
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR])
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[name] = package
+    return package
+
+
+if not __package__:  # 스크립트로 직접 실행한 경우
+    load_package()
+    from seed_wildcard_pack.lora_tags import parse_lora_tags
+    from seed_wildcard_pack.wildcard_engine import get_engine
+    from seed_wildcard_pack.wildcard_graph import TAG_MODES
+    from seed_wildcard_pack.wildcard_template import SAMPLING_MODES
+    from seed_wildcard_pack.wildcard_unique import UniqueFilter
+else:
+    from .lora_tags import parse_lora_tags
+    from .wildcard_engine import get_engine
+    from .wildcard_graph import TAG_MODES
+    from .wildcard_template import SAMPLING_MODES
+    from .wildcard_unique import UniqueFilter
+
+DEFAULT_SHARD_SIZE = 5000
+# ComfyUI folder_paths.supported_pt_extensions 와 동일
+LORA_EXTENSIONS = ('.ckpt', '.pt', '.pt2', '.bin', '.pth', '.safetensors', '.pkl', '.sft')
+
+
+class PromptGenerator:
+    """시드 하나를 (lora_stack, 정제된 텍스트) 로 변환합니다. (SeedBasedWildcardLora.process 와 동일한 결과)"""
+
+    def __init__(self, wildcard_dir, wildcard_file, available_loras=(), sampling="compatible", tag_rules="exact"):
+        engine = get_engine(wildcard_dir, tag_rules)
+        # 줄과 태그 맵은 한 번만 가져오고 시드마다 재사용
+        self.expand = engine.bind(engine.file_path(wildcard_file), sampling)
+        self.available_loras = list(available_loras)
+
+    def generate(self, seed, attempt=0):
+        processed_text = self.expand(seed, attempt)
+        # 대량 생성 중에는 매칭 실패 경고를 매번 출력하지 않음
+        return parse_lora_tags(processed_text, self.available_loras, warn=False)
+
+
+def scan_lora_dir(lora_dir):
+    """folder_paths.get_filename_list("loras") 와 같은 형태(상대 경로, 정렬)의 목록을 만듭니다."""
+    loras = []
+    for root, dirs, filenames in os.walk(lora_dir, followlinks=True):
+        for filename in filenames:
+            if filename.lower().endswith(LORA_EXTENSIONS):
+                loras.append(os.path.relpath(os.path.join(root, filename), lora_dir))
+    return sorted(loras)
+
+
+# --- 워커 프로세스 ---
+
+_worker_generator = None
+
+
+def _init_worker(wildcard_dir, wildcard_file, available_loras, sampling="compatible", tag_rules="exact"):
+    global _worker_generator
+    _worker_generator = PromptGenerator(wildcard_dir, wildcard_file, available_loras, sampling, tag_rules)
+
+
+def _encode_jsonl(seed, lora_stack, text):
+    record = {"seed": seed, "prompt": text, "loras": [list(entry) for entry in lora_stack]}
+    return json.dumps(record, ensure_ascii=False)
+
+
+def _encode_loras(lora_stack):
+    return json.dumps([list(entry) for entry in lora_stack], ensure_ascii=False)
+
+
+def _run_shard(start, stop, output_format):
+    generate = _worker_generator.generate
+    if output_format == "jsonl":
+        # 인코딩까지 워커에서 처리해 메인 프로세스는 쓰기만 함
+        lines = []
+        for seed in range(start, stop):
+            lora_stack, text = generate(seed)
+            lines.append(_encode_jsonl(seed, lora_stack, text))
+        return "\n".join(lines) + "\n"
+    seeds, prompts, loras = [], [], []
+    for seed in range(start, stop):
+        lora_stack, text = generate(seed)
+        seeds.append(seed)
+        prompts.append(text)
+        loras.append(_encode_loras(lora_stack))
+    return seeds, prompts, loras
+
+
+def _plan_shards(start_seed, count, shard_size, chunk_rows):
+    """(chunk 번호, start, stop) 목록. shard 는 chunk 경계를 넘지 않습니다."""
+    chunk_rows = chunk_rows or count
+    end = start_seed + count
+    for chunk_id, chunk_start in enumerate(range(start_seed, end, chunk_rows)):
+        chunk_end = min(chunk_start + chunk_rows, end)
+        for shard_start in range(chunk_start, chunk_end, shard_size):
+            yield chunk_id, shard_start, min(shard_start + shard_size, chunk_end)
+
+
+def iter_shards(wildcard_dir, wildcard_file, start_seed, count, available_loras=(),
+                workers=None, shard_size=DEFAULT_SHARD_SIZE, output_format="jsonl", chunk_rows=0,
+                sampling="compatible", tag_rules="exact", unique=False):
+    """
+    shard 결과를 시드 순서대로 (chunk 번호, 결과) 로 yield 합니다.
+    진행 중인 shard 수를 워커 수의 2배로 제한해 메모리 사용량이 범위 크기와 무관하게 유지됩니다.
+    unique 이면 이미 나온 (프롬프트, LoRA) 대신 같은 시드의 다음 대체 시도를 사용합니다 (wildcard_unique).
+    UniqueFilter 를 넘기면 그 필터에 기록하므로, 끝난 뒤 unique.summary() 로 중복률을 확인할 수 있습니다.
+    """
+    if unique:
+        if not isinstance(unique, UniqueFilter):
+            unique = UniqueFilter(count)
+        init_args = (wildcard_dir, wildcard_file, list(available_loras), sampling, tag_rules)
+        shard_iter = iter_shards(wildcard_dir, wildcard_file, start_seed, count, available_loras, workers,
+                                 shard_size, "columns", chunk_rows, sampling, tag_rules)
+        yield from _dedup_shards(shard_iter, init_args, unique, output_format)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    shards = _plan_shards(start_seed, count, shard_size, chunk_rows)
+    init_args = (wildcard_dir, wildcard_file, list(available_loras), sampling, tag_rules)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        for chunk_id, start, stop in shards:
+            yield chunk_id, _run_shard(start, stop, output_format)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as executor:
+        pending = deque()
+        for chunk_id, start, stop in shards:
+            pending.append((chunk_id, executor.submit(_run_shard, start, stop, output_format)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def _dedup_shards(shard_iter, init_args, unique, output_format):
+    """
+    워커 결과(columns)를 시드 순서대로 확인해 중복만 메인 프로세스에서 다시 뽑습니다.
+    순서가 고정이므로 워커 수와 무관하게 같은 결과가 나옵니다.
+    """
+    generator = PromptGenerator(*init_args)
+    record_key = lambda text, loras_json: text + "\0" + loras_json
+    alternative_key = lambda entry: record_key(entry[1], _encode_loras(entry[0]))
+
+    for chunk_id, (seeds, prompts, loras) in shard_iter:
+        for i, seed in enumerate(seeds):
+            if unique.check(record_key(prompts[i], loras[i])):
+                continue
+            found = unique.retry((generator.generate(seed, attempt) for attempt in range(1, unique.max_attempts)),
+                                 key=alternative_key)
+            if found is not None:
+                prompts[i], loras[i] = found[1], _encode_loras(found[0])
+        if output_format == "jsonl":
+            yield chunk_id, "\n".join(_encode_jsonl(seed, json.loads(lora_json), text)
+                                      for seed, text, lora_json in zip(seeds, prompts, loras)) + "\n"
+        else:
+            yield chunk_id, (seeds, prompts, loras)
+
+
+def iter_prompts(wildcard_dir, wildcard_file, start_seed, count, available_loras=(),
+                 workers=None, shard_size=DEFAULT_SHARD_SIZE, sampling="compatible", tag_rules="exact",
+                 unique=False):
+    """(seed, prompt, lora_stack) 를 시드 순서대로 yield 하는 API."""
+    for _, (seeds, prompts, loras) in iter_shards(wildcard_dir, wildcard_file, start_seed, count,
+                                                  available_loras, workers, shard_size, "columns",
+                                                  sampling=sampling, tag_rules=tag_rules, unique=unique):
+        for seed, prompt, lora_json in zip(seeds, prompts, loras):
+            yield seed, prompt, [tuple(entry) for entry in json.loads(lora_json)]
+
+
+def _chunk_path(out, chunk_id, extension):
+    root, _ = os.path.splitext(out)
+    return f"{root}-{chunk_id:05d}{extension}"
+
+
+def write_output(out, shard_iter, output_format="jsonl", chunked=False):
+    """shard 결과를 파일(또는 out='-' 이면 stdout)에 기록합니다. 기록한 파일 목록을 반환."""
+    if output_format == "parquet":
+        return _write_parquet(out, shard_iter, chunked)
+
+    written = []
+    handle = None
+    current_chunk = None
+    try:
+        for chunk_id, block in shard_iter:
+            if handle is None or (chunked and chunk_id != current_chunk):
+                if handle is not None and handle is not sys.stdout:
+                    handle.close()
+                if out == "-":
+                    handle = sys.stdout
+                else:
+                    path = _chunk_path(out, chunk_id, ".jsonl") if chunked else out
+                    handle = open(path, "w", encoding="utf-8")
+                    written.append(path)
+                current_chunk = chunk_id
+            handle.write(block)
+    finally:
+        if handle is not None and handle is not sys.stdout:
+            handle.close()
+    return written
+
+
+def _write_parquet(out, shard_iter, chunked):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("parquet output requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([("seed", pa.uint64()), ("prompt", pa.string()), ("loras", pa.string())])
+    written = []
+    writer = None
+    current_chunk = None
+    try:
+        for chunk_id, (seeds, prompts, loras) in shard_iter:
+            if writer is None or (chunked and chunk_id != current_chunk):
+                if writer is not None:
+                    writer.close()
+                path = _chunk_path(out, chunk_id, ".parquet") if chunked else out
+                writer = pq.ParquetWriter(path, schema)
+                written.append(path)
+                current_chunk = chunk_id
+            writer.write_table(pa.table([seeds, prompts, loras], schema=schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate wildcard prompts and LoRA stacks for a seed range.")
+    parser.add_argument("--wildcards", required=True, help="wildcards folder (ComfyUI-Impact-Pack/wildcards)")
+    parser.add_argument("--file", required=True, help="wildcard file relative to the wildcards folder")
+    parser.add_argument("--start", type=int, default=1, help="first seed (default: 1)")
+    parser.add_argument("--count", type=int, required=True, help="number of seeds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="seeds per task")
+    parser.add_argument("--loras-dir", default=None, help="LoRA folder used to resolve <lora:...> names")
+    parser.add_argument("--out", default="-", help="output path, '-' for stdout (jsonl only)")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--chunk-rows", type=int, default=0, help="split output into files of N rows")
+    parser.add_argument("--sampling", choices=SAMPLING_MODES, default="compatible",
+                        help="'alias' is faster but selects differently than the nodes' default")
+    parser.add_argument("--tag-rules", choices=sorted(TAG_MODES), default="exact",
+                        help="'exact' (Lora node default) or 'impact' (paths, case-insensitive, like the Selector)")
+    parser.add_argument("--unique", action="store_true",
+                        help="replace repeated prompts with the seed's next unseen alternative")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and args.out == "-":
+        parser.error("parquet output needs --out")
+    if args.chunk_rows and args.out == "-":
+        parser.error("--chunk-rows needs --out")
+
+    available_loras = scan_lora_dir(args.loras_dir) if args.loras_dir else []
+    output_format = "jsonl" if args.format == "jsonl" else "columns"
+    unique = UniqueFilter(args.count) if args.unique else None
+    shard_iter = iter_shards(args.wildcards, args.file, args.start, args.count, available_loras,
+                             args.workers, args.shard_size, output_format, args.chunk_rows, args.sampling,
+                             args.tag_rules, unique)
+    written = write_output(args.out, shard_iter, args.format, chunked=bool(args.chunk_rows))
+    for path in written:
+        print(path, file=sys.stderr)
+    if unique is not None:
+        print(f"unique: {unique.summary()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
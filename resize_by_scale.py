@@ -1,3 +1,8 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrumentation import instrumented, logger, metrics
+
 class ResizeByScale:
     @classmethod
     def INPUT_TYPES(cls):
@@ -12,6 +17,12 @@ class ResizeByScale:
                 "base_height": ("INT", {"default": 512, "min": 0, "max": 4096}),
                 "scale": ("FLOAT", {"default": 1.0, "min": 0.1, "max": 10.0}),
                 "crop": ("BOOLEAN", {"default": False}),
+            },
+            "optional": {
+                # torch: 배치 전체를 한 번에 보간 (float32 유지, uint8 변환 없음)
+                "backend": (["opencv", "torch"], {"default": "opencv"}),
+                # opencv: 프레임 병렬 처리 스레드 수 (기본 1 = 호출마다 풀을 만들지 않음, 0 = CPU 코어 수)
+                "threads": ("INT", {"default": 1, "min": 0, "max": 64}),
             }
         }
 
@@ -37,11 +48,8 @@ class ResizeByScale:
         else:
             raise TypeError(f"Unsupported image type: {type(img)}")
 
-    def resize(self, image, resize_method, base_width, base_height, scale, crop):
-        import cv2
-        import numpy as np
-        import torch
-
+    @instrumented("ResizeByScale")
+    def resize(self, image, resize_method, base_width, base_height, scale, crop, backend="opencv", threads=1):
         # 계산된 해상도
         new_width = int(base_width * scale)
         new_height = int(base_height * scale)
@@ -52,6 +60,19 @@ class ResizeByScale:
         new_width = max(new_width, MIN_WIDTH)
         new_height = max(new_height, MIN_HEIGHT)
 
+        with metrics.phase(f"ResizeByScale.{backend}"):
+            if backend == "torch":
+                batch_tensor = self.resize_torch(image, resize_method, new_width, new_height, base_width, base_height, crop)
+            else:
+                batch_tensor = self.resize_opencv(image, resize_method, new_width, new_height, base_width, base_height, crop, threads)
+
+        logger.debug("ResizeByScale final tensor shape: %s", tuple(batch_tensor.shape))
+        return (batch_tensor,)
+
+    def resize_opencv(self, image, resize_method, new_width, new_height, base_width, base_height, crop, threads=1):
+        import cv2
+        import torch
+
         # 보간법 설정
         method_map = {
             "Lanczos": cv2.INTER_LANCZOS4,
@@ -61,37 +82,91 @@ class ResizeByScale:
         }
         interpolation = method_map.get(resize_method, cv2.INTER_LANCZOS4)
 
-        resized_images = []
-        for img in image:
+        crop_box = None
+        if crop:
+            if new_width < base_width or new_height < base_height:
+                logger.warning("[ResizeByScale] Crop skipped: resized image is smaller than base dimensions.")
+            else:
+                start_x = (new_width - base_width) // 2
+                start_y = (new_height - base_height) // 2
+                crop_box = (start_y, start_y + base_height, start_x, start_x + base_width)
+
+        def resize_frame(img):
             np_img = self.convert_to_numpy(img)
             resized = cv2.resize(np_img, (new_width, new_height), interpolation=interpolation)
+            if crop_box is not None:
+                start_y, end_y, start_x, end_x = crop_box
+                resized = resized[start_y:end_y, start_x:end_x]
+            return resized
 
-            if crop:
-                if new_width < base_width or new_height < base_height:
-                    print("⚠️ Crop skipped: resized image is smaller than base dimensions.")
-                else:
-                    start_x = (new_width - base_width) // 2
-                    start_y = (new_height - base_height) // 2
-                    end_x = start_x + base_width
-                    end_y = start_y + base_height
-                    resized = resized[start_y:end_y, start_x:end_x]
-
-            resized_images.append(resized)
-
-        # numpy → torch.Tensor (B, C, H, W)
-        tensor_images = []
-        for img in resized_images:
-            img = img.transpose(2, 0, 1)  # HWC → CHW
-            img = torch.from_numpy(img).float() / 255.0
-            tensor_images.append(img)
-
-        if len(tensor_images) == 1:
-            batch_tensor = tensor_images[0].unsqueeze(0)  # (1, C, H, W)
+        # 첫 프레임으로 출력 크기를 확인한 뒤 (B, C, H, W) 텐서를 한 번만 할당하고,
+        # 각 프레임을 자기 슬라이스에 바로 기록 (중간 리스트/stack 복사 없음)
+        first = resize_frame(image[0])
+        out_h, out_w = first.shape[:2]
+        channels = first.shape[2] if first.ndim == 3 else 1
+        batch_tensor = torch.empty((len(image), channels, out_h, out_w), dtype=torch.float32)
+
+        def write_frame(i, resized):
+            if resized.ndim == 2:
+                resized = resized[:, :, None]
+            target = batch_tensor[i]
+            target.copy_(torch.from_numpy(resized.transpose(2, 0, 1)))  # HWC → CHW
+            target.div_(255.0)
+
+        def process(i):
+            write_frame(i, resize_frame(image[i]))
+
+        write_frame(0, first)
+        if threads <= 0:
+            threads = os.cpu_count() or 1
+        threads = min(threads, len(image) - 1)
+        if threads > 1:
+            # cv2.resize 는 GIL 을 해제하므로 스레드 수만큼 병렬로 처리됨
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(process, range(1, len(image))))
         else:
-            batch_tensor = torch.stack(tensor_images)     # (B, C, H, W)
+            for i in range(1, len(image)):
+                process(i)
 
-        print(f"[DEBUG] Final tensor shape: {batch_tensor.shape}")
-        return (batch_tensor,)
+        return batch_tensor
+
+    def resize_torch(self, image, resize_method, new_width, new_height, base_width, base_height, crop):
+        import torch
+        import torch.nn.functional as F
+
+        # torch 에는 Lanczos 가 없으므로 antialias bicubic 으로 대체
+        mode_map = {
+            "Lanczos": ("bicubic", True),
+            "Bicubic": ("bicubic", True),
+            "Bilinear": ("bilinear", True),
+            "Nearest": ("nearest", False),
+        }
+        mode, antialias = mode_map.get(resize_method, ("bicubic", True))
+
+        # (B, H, W, C) → (B, C, H, W) 뷰 (복사 없음)
+        batch = image.detach()
+        if batch.dtype != torch.float32:
+            batch = batch.float()
+        batch = batch.movedim(-1, 1)
+
+        if mode == "nearest":
+            resized = F.interpolate(batch, size=(new_height, new_width), mode=mode)
+        else:
+            resized = F.interpolate(batch, size=(new_height, new_width), mode=mode,
+                                    align_corners=False, antialias=antialias)
+            # bicubic 오버슈트 보정 (opencv 경로의 uint8 클리핑과 동일한 범위)
+            resized.clamp_(0.0, 1.0)
+
+        if crop:
+            if new_width < base_width or new_height < base_height:
+                logger.warning("[ResizeByScale] Crop skipped: resized image is smaller than base dimensions.")
+            else:
+                start_x = (new_width - base_width) // 2
+                start_y = (new_height - base_height) // 2
+                # 슬라이싱 뷰로 자르고 마지막에 한 번만 연속 메모리로 정리
+                resized = resized[:, :, start_y:start_y + base_height, start_x:start_x + base_width].contiguous()
+
+        return resized  # (B, C, H, W), float32
 
 NODE_CLASS_MAPPINGS = {
     "ResizeByScale": ResizeByScale
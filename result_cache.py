@@ -0,0 +1,147 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from .instrumentation import metrics
+
+# 기본 항목 수. 환경변수 SEED_WILDCARD_RESULT_CACHE 로 조정 (0 = 저장하지 않음)
+DEFAULT_RESULT_CACHE_SIZE = 1024
+# 저장된 결과 값의 추정 바이트 합계 상한 (MB). 환경변수 SEED_WILDCARD_RESULT_CACHE_MB 로 조정
+DEFAULT_RESULT_CACHE_MB = 64
+
+# 값을 보관하지 않은 항목 (예산보다 큰 결과: 의존성과 fingerprint 만 유지)
+_NOT_STORED = object()
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ResultCache:
+    """
+    노드 실행 결과(확장된 프롬프트, LoRA 스택 등)의 LRU 캐시.
+    결과는 (파일, 시드, 샘플링) 과 파일 내용에만 의존하므로, 계산 중에 읽은 모든 파일을 기록해 두고
+    - 인덱스 generation (태그 -> 파일 매핑)
+    - 읽은 파일들의 (mtime_ns, size)
+    - extra (예: LoRA 파일 목록)
+    가 모두 같을 때만 재사용합니다. 같은 값으로 IS_CHANGED 용 fingerprint 를 만듭니다.
+    용량은 항목 수(maxsize)와 값의 추정 바이트 합계(max_bytes) 둘 다로 제한합니다.
+    max_bytes 보다 큰 값은 보관하지 않고 fingerprint 만 남겨 둡니다 (다른 항목을 모두 밀어내지 않도록).
+    """
+
+    def __init__(self, maxsize=DEFAULT_RESULT_CACHE_SIZE, max_bytes=DEFAULT_RESULT_CACHE_MB * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        # key -> (generation, ((path, signature), ...), extra, value, fingerprint, nbytes)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, path):
+        """계산 중 읽은 파일을 의존성으로 기록합니다. (get_or_compute 밖에서는 아무것도 하지 않음)"""
+        stack = getattr(self._local, "stack", None)
+        if stack:
+            stack[-1].add(path)
+
+    def _valid_entry(self, key, generation, extra):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry_generation, deps, entry_extra = entry[:3]
+        if (entry_generation == generation and entry_extra == extra
+                and all(file_signature(path) == signature for path, signature in deps)):
+            return entry
+        return None
+
+    def fingerprint(self, key, generation, extra=None):
+        """
+        계산하지 않고 fingerprint 만 반환합니다 (IS_CHANGED 용).
+        유효한 항목이 없으면 None (호출 측은 '바뀜' 으로 취급하고, 실제 실행에서 계산해 기록됨).
+        """
+        entry = self._valid_entry(key, generation, extra)
+        return None if entry is None else entry[4]
+
+    def get_or_compute(self, key, generation, compute, extra=None):
+        """(value, fingerprint) 를 반환합니다. 유효한 항목이 없으면 compute() 로 계산해 저장합니다."""
+        entry = self._valid_entry(key, generation, extra)
+        if entry is not None and entry[3] is not _NOT_STORED:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+            if metrics.enabled:
+                metrics.incr("result_cache.hits")
+            return entry[3], entry[4]
+        if metrics.enabled:
+            metrics.incr("result_cache.misses")
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(set())
+        try:
+            value = compute()
+        finally:
+            touched = stack.pop()
+            if stack:
+                stack[-1].update(touched)  # 중첩 계산이면 바깥 항목의 의존성에도 포함
+
+        deps = tuple((path, file_signature(path)) for path in sorted(touched))
+        fingerprint = hashlib.sha1(repr((generation, deps, extra)).encode("utf-8", "surrogatepass")).hexdigest()
+        if self.maxsize > 0:
+            nbytes = _value_bytes(value)
+            stored = value
+            if nbytes > self.max_bytes:
+                if metrics.enabled:
+                    metrics.incr("result_cache.too_large")
+                stored, nbytes = _NOT_STORED, 0
+            with self._lock:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._total_bytes -= old[5]
+                self._entries[key] = (generation, deps, extra, stored, fingerprint, nbytes)
+                self._total_bytes += nbytes
+                while len(self._entries) > self.maxsize or self._total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._total_bytes -= evicted[5]
+        return value, fingerprint
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+
+def _value_bytes(value):
+    """결과 값의 대략적인 메모리 크기 (문자열/튜플/리스트/딕셔너리를 따라감)."""
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(map(_value_bytes, value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_value_bytes(k) + _value_bytes(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+def _size_from_env(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _megabytes_from_env(name, default):
+    try:
+        return int(float(os.environ.get(name, default)) * 1024 * 1024)
+    except ValueError:
+        return default * 1024 * 1024
+
+
+# 와일드카드 노드들이 공유하는 프로세스 전역 결과 캐시
+result_cache = ResultCache(_size_from_env("SEED_WILDCARD_RESULT_CACHE", DEFAULT_RESULT_CACHE_SIZE),
+                           _megabytes_from_env("SEED_WILDCARD_RESULT_CACHE_MB", DEFAULT_RESULT_CACHE_MB))
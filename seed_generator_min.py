@@ -1,4 +1,9 @@
 import random
+import sys
+from array import array
+from .instrumentation import instrumented, metrics
+
+SEED_MAX = 0xffffffffffffffff
 
 class SeedGeneratorWithMin:
     """
@@ -23,6 +28,7 @@ class SeedGeneratorWithMin:
     FUNCTION = "generate_seed"
     CATEGORY = "Custom/Wildcard"
 
+    @instrumented("SeedGeneratorWithMin")
     def generate_seed(self, seed):
         # 1 미만의 값(0)이 들어오면 무조건 새로운 난수 발급
         if seed < 1:
@@ -30,11 +36,67 @@ class SeedGeneratorWithMin:
         
         return (seed, float(seed), str(seed))
 
+
+def generate_seeds(base_seed, count):
+    """
+    base_seed 로 초기화한 독립된 난수열에서 1..0xffffffffffffffff 범위의 시드 count 개를 만듭니다.
+    같은 (base_seed, count) 는 어느 환경에서나 같은 목록이고, count 를 늘려도 앞부분은 그대로입니다.
+    """
+    rng = random.Random(base_seed)
+    # 8바이트씩 잘라 64비트 정수로 해석 (파이썬 루프 없이 한 번에 변환)
+    seeds = array("Q", rng.randbytes(8 * count))
+    if sys.byteorder == "big":
+        seeds.byteswap()
+    seeds = seeds.tolist()
+    # 0 은 최소값 1 규칙에 어긋나므로 같은 난수열에서 다시 뽑음 (확률 2^-64)
+    while 0 in seeds:
+        value = 0
+        while value == 0:
+            value = rng.getrandbits(64)
+        seeds[seeds.index(0)] = value
+    return seeds
+
+
+class SeedBatchGenerator:
+    """
+    시드 하나(base_seed)로부터 재현 가능한 시드 N 개를 한 번의 실행으로 만듭니다.
+    base_seed 가 0 이면 SeedGeneratorWithMin 과 같이 새로운 무작위 base_seed 를 발급합니다.
+    seed_list 출력은 Seed Based Wildcard (Batch) 의 seed_list 입력에 바로 연결할 수 있습니다.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "base_seed": ("INT", {"default": 1, "min": 0, "max": SEED_MAX}),
+                "count": ("INT", {"default": 100, "min": 1, "max": 1000000}),
+            }
+        }
+
+    RETURN_TYPES = ("INT", "STRING", "INT")
+    RETURN_NAMES = ("seeds", "seed_list", "base_seed")
+    OUTPUT_IS_LIST = (True, False, False)
+    FUNCTION = "generate"
+    CATEGORY = "Custom/Wildcard"
+
+    @instrumented("SeedBatchGenerator")
+    def generate(self, base_seed, count):
+        if base_seed < 1:
+            base_seed = random.randint(1, SEED_MAX)
+
+        with metrics.phase("SeedBatchGenerator.generate"):
+            seeds = generate_seeds(base_seed, count)
+        with metrics.phase("SeedBatchGenerator.join"):
+            seed_list = ",".join(map(str, seeds))
+        return (seeds, seed_list, base_seed)
+
 # 노드 매핑
 NODE_CLASS_MAPPINGS = {
-    "SeedGeneratorWithMin": SeedGeneratorWithMin
+    "SeedGeneratorWithMin": SeedGeneratorWithMin,
+    "SeedBatchGenerator": SeedBatchGenerator
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
-    "SeedGeneratorWithMin": "Seed Generator (Strict Random)"
+    "SeedGeneratorWithMin": "Seed Generator (Strict Random)",
+    "SeedBatchGenerator": "Seed Generator (Batch List)"
 }
\ No newline at end of file
@@ -1,42 +1,32 @@
-import os
-import folder_paths
-import random
-import re
+from .instrumentation import instrumented
+from .wildcard_engine import get_engine
+from .wildcard_template import SAMPLING_MODES
+from .wildcard_unique import UNIQUE_MODES
 
 class SeedBasedWildcardImpact:
     """
     ComfyUI-Impact-Pack의 wildcards 폴더 내 .txt 파일을 선택하고,
-    시드값에 따라 특정 줄을 반환한 뒤, 
+    시드값에 따라 특정 줄을 반환한 뒤,
     해당 줄에 포함된 와일드카드 구문(__tag__, {a|b})을 처리하는 노드.
     (기능: 경로 포함 태그 지원, 대소문자 무시 매칭, 재귀 호출)
+    인덱스/캐시/해석은 모든 와일드카드 노드가 공유하는 엔진(wildcard_engine)이 담당합니다.
     """
-    
-    def __init__(self):
-        self.wildcard_map = {}
-        self.base_dir = os.path.join(folder_paths.base_path, "custom_nodes", "ComfyUI-Impact-Pack", "wildcards")
 
     @classmethod
     def INPUT_TYPES(s):
-        wildcard_dir = os.path.join(folder_paths.base_path, "custom_nodes", "ComfyUI-Impact-Pack", "wildcards")
-        
-        files = []
-        if os.path.exists(wildcard_dir):
-            for root, dirs, filenames in os.walk(wildcard_dir):
-                for filename in filenames:
-                    if filename.endswith('.txt'):
-                        full_path = os.path.join(root, filename)
-                        rel_path = os.path.relpath(full_path, wildcard_dir)
-                        files.append(rel_path)
-            files.sort()
-            
-        if not files:
-            files = ["no_txt_files_found.txt"]
-
         return {
             "required": {
-                "wildcard_file": (files, ), 
+                "wildcard_file": (get_engine().files(), ),
                 "seed": ("INT", {"default": 1, "min": 1, "max": 0xffffffffffffffff}),
             },
+            "optional": {
+                # compatible: 기존과 동일한 결과 / alias: O(1) 가중치 샘플링 (결과가 달라짐)
+                "sampling": (SAMPLING_MODES, {"default": "compatible"}),
+                # 같은 경로에서 이미 해석 중인 파일로 다시 들어가는 태그는 그대로 둠 (기본값은 기존처럼 깊이 제한까지 확장)
+                "cut_cycles": ("BOOLEAN", {"default": False}),
+                # session: 이 파일에서 이미 나온 프롬프트면 같은 시드의 다음 대체 결과를 사용 (재시작 전까지 유지)
+                "unique": (UNIQUE_MODES, {"default": "off"}),
+            },
         }
 
     RETURN_TYPES = ("STRING",)
@@ -44,103 +34,35 @@ class SeedBasedWildcardImpact:
     FUNCTION = "process"
     CATEGORY = "Custom/Wildcard"
 
-    def process(self, wildcard_file, seed):
-        file_path = os.path.join(self.base_dir, wildcard_file)
-        
-        # 맵 갱신 (대소문자 무시 매칭을 위해 필수)
-        self.refresh_wildcard_map()
-
-        lines = self.load_lines(file_path)
-        if not lines:
-            return ("",)
-
-        n = len(lines)
-        index = (seed - 1) % n
-        selected_line = lines[index]
-        
-        rng = random.Random(seed)
-        final_text = self.resolve_wildcards(selected_line, rng)
-        
+    @classmethod
+    def IS_CHANGED(s, wildcard_file, seed, sampling="compatible", cut_cycles=False, unique="off", **kwargs):
+        if unique != "off":
+            # 결과가 이전 실행들에 따라 달라지므로 매번 실행
+            return float("nan")
+        # 결과가 의존하는 파일들이 그대로면 같은 값 -> ComfyUI 가 재실행하지 않음
+        return s.expand_cached(wildcard_file, seed, sampling, cut_cycles)[1]
+
+    @instrumented("SeedBasedWildcardImpact")
+    def process(self, wildcard_file, seed, sampling="compatible", cut_cycles=False, unique="off"):
+        if unique == "session":
+            engine = get_engine()
+            file_path = engine.file_path(wildcard_file)
+            return (engine.expand_session_unique("SeedBasedWildcardImpact", file_path, (seed,), sampling, cut_cycles)[0],)
+        final_text, _ = self.expand_cached(wildcard_file, seed, sampling, cut_cycles)
         return (final_text,)
 
-    def load_lines(self, path):
-        if os.path.exists(path) and os.path.isfile(path):
-            try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    return [line.strip() for line in f.readlines() if line.strip()]
-            except Exception as e:
-                print(f"[SeedWildcard] Error reading {path}: {e}")
-        return []
-
-    def refresh_wildcard_map(self):
-        self.wildcard_map = {}
-        if os.path.exists(self.base_dir):
-            for root, dirs, filenames in os.walk(self.base_dir):
-                for filename in filenames:
-                    if filename.endswith('.txt'):
-                        # [Key] 파일명 소문자로 통일 (확장자 제외)
-                        key = os.path.splitext(filename)[0].lower()
-                        self.wildcard_map[key] = os.path.join(root, filename)
-
-    def resolve_wildcards(self, text, rng, depth=0):
-        if depth > 20: 
-            return text
-
-        original_text = text
-
-        # 1. Dynamic Prompts: {a|b}
-        while True:
-            match = re.search(r'\{([^{}]+)\}', text)
-            if not match: break
-            content = match.group(1)
-            segments = content.split('|')
-            options = []
-            weights = []
-            for segment in segments:
-                if '::' in segment:
-                    try:
-                        weight_str, val = segment.split('::', 1)
-                        weight = float(weight_str)
-                    except ValueError:
-                        weight = 1.0
-                        val = segment
-                else:
-                    weight = 1.0
-                    val = segment
-                options.append(val)
-                weights.append(weight)
-            try:
-                choice = rng.choices(options, weights=weights, k=1)[0]
-            except ValueError:
-                choice = options[0] if options else ""
-            text = text[:match.start()] + choice + text[match.end():]
-
-        # 2. Wildcard File: __tag__ (경로 포함, 대소문자 무시)
-        def replace_wildcard(match):
-            full_tag = match.group(1)
-            basename = os.path.basename(full_tag) # 경로 제거
-            key = os.path.splitext(basename)[0].lower() # 소문자 변환
-
-            if key in self.wildcard_map:
-                target_path = self.wildcard_map[key]
-                lines = self.load_lines(target_path)
-                if lines:
-                    return rng.choice(lines)
-            
-            return match.group(0)
-
-        # 정규표현식: 점(.)과 슬래시(/, \) 포함 인식
-        text = re.sub(r'__([\w\-\s./\\]+)__', replace_wildcard, text)
-
-        # 3. 재귀 호출
-        if text != original_text:
-            return self.resolve_wildcards(text, rng, depth + 1)
-        
-        return text
+    @staticmethod
+    def expand_cached(wildcard_file, seed, sampling="compatible", cut_cycles=False):
+        """(결과, fingerprint). 같은 입력이고 참조한 파일들이 바뀌지 않았으면 다시 해석하지 않습니다."""
+        engine = get_engine()
+        file_path = engine.file_path(wildcard_file)
+        return engine.cached(("SeedBasedWildcardImpact", file_path, seed, sampling, cut_cycles),
+                             lambda cut_paths: engine.expand(file_path, seed, sampling, cut_paths),
+                             cut_cycles, file_path=file_path)
 
 NODE_CLASS_MAPPINGS = {
     "SeedBasedWildcardImpact": SeedBasedWildcardImpact
 }
 NODE_DISPLAY_NAME_MAPPINGS = {
     "SeedBasedWildcardImpact": "Seed Based Wildcard (Impact & Weighted)"
-}
\ No newline at end of file
+}
@@ -0,0 +1,113 @@
+import re
+from .instrumentation import instrumented
+from .seed_generator_min import SEED_MAX
+from .seed_wildcard import SeedBasedWildcardImpact
+from .wildcard_engine import get_engine
+from .wildcard_unique import BATCH_UNIQUE_MODES
+
+class SeedBasedWildcardBatch(SeedBasedWildcardImpact):
+    """
+    SeedBasedWildcardImpact 와 같은 규칙으로 여러 시드를 한 번에 처리하는 배치 노드.
+    (start_seed 부터 count 개, 또는 seed_list 에 적힌 시드들)
+    공유 엔진이 폴더 인덱스 갱신과 파일 읽기를 한 번만 하고, 컴파일된 템플릿을 재사용합니다.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        inputs = super().INPUT_TYPES()
+        files = inputs["required"]["wildcard_file"]
+        return {
+            "required": {
+                "wildcard_file": files,
+                "start_seed": ("INT", {"default": 1, "min": 1, "max": SEED_MAX}),
+                "count": ("INT", {"default": 10, "min": 1, "max": 1000000}),
+                "delimiter": ("STRING", {"default": "\\n", "multiline": False}),
+            },
+            "optional": {
+                # 쉼표/공백/줄바꿈으로 구분된 시드 목록 (비어있지 않으면 start_seed/count 대신 사용)
+                "seed_list": ("STRING", {"default": "", "multiline": True}),
+                "sampling": inputs["optional"]["sampling"],
+                "cut_cycles": inputs["optional"]["cut_cycles"],
+                # run: 이 배치 안에서 중복 없음 / session: 이전 실행들에서 나온 프롬프트도 피함
+                "unique": (BATCH_UNIQUE_MODES, {"default": "off"}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("prompts", "joined_text")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "process_batch"
+    CATEGORY = "Custom/Wildcard"
+
+    @classmethod
+    def IS_CHANGED(s, wildcard_file, start_seed, count, delimiter="\\n", seed_list="", sampling="compatible",
+                   cut_cycles=False, unique="off", **kwargs):
+        if unique == "session":
+            # 결과가 이전 실행들에 따라 달라지므로 매번 실행
+            return float("nan")
+        seeds = s.parse_seeds(seed_list) or range(start_seed, start_seed + count)
+        engine, file_path, key = s.cache_key(wildcard_file, seeds, sampling, cut_cycles, unique)
+        # 저장된 결과가 아직 유효할 때만 같은 값 (배치를 해석하지 않음). 없으면 실행해서 새로 계산
+        fingerprint = engine.fingerprint(key, cut_cycles, file_path=file_path)
+        return float("nan") if fingerprint is None else fingerprint
+
+    @instrumented("SeedBasedWildcardBatch")
+    def process_batch(self, wildcard_file, start_seed, count, delimiter="\\n", seed_list="", sampling="compatible",
+                      cut_cycles=False, unique="off"):
+        seeds = self.parse_seeds(seed_list) or range(start_seed, start_seed + count)
+        if unique == "session":
+            engine = get_engine()
+            file_path = engine.file_path(wildcard_file)
+            prompts = engine.expand_session_unique("SeedBasedWildcardBatch", file_path, seeds, sampling, cut_cycles)
+        else:
+            prompts, _ = self.expand_seeds_cached(wildcard_file, seeds, sampling, cut_cycles, unique)
+            prompts = list(prompts)
+        # "\n" 처럼 이스케이프로 입력된 구분자 허용
+        delimiter = delimiter.replace("\\n", "\n").replace("\\t", "\t")
+        return (prompts, delimiter.join(prompts))
+
+    @staticmethod
+    def expand_seeds_cached(wildcard_file, seeds, sampling="compatible", cut_cycles=False, unique="off"):
+        """
+        (프롬프트 목록, fingerprint). 같은 시드 목록이고 참조한 파일들이 그대로면 다시 해석하지 않습니다.
+        unique="run" 도 입력이 같으면 결과가 같으므로 캐시합니다.
+        """
+        engine, file_path, key = SeedBasedWildcardBatch.cache_key(wildcard_file, seeds, sampling, cut_cycles, unique)
+        return engine.cached(key,
+                             lambda cut_paths: tuple(engine.expand_seeds(
+                                 file_path, seeds, sampling, cut_paths, engine.unique_filter(unique, file_path, len(seeds)))),
+                             cut_cycles, file_path=file_path)
+
+    @staticmethod
+    def cache_key(wildcard_file, seeds, sampling="compatible", cut_cycles=False, unique="off"):
+        """(엔진, 파일 경로, 결과 캐시 키)."""
+        engine = get_engine()
+        file_path = engine.file_path(wildcard_file)
+        # range 는 (start, stop) 으로 키를 만들어 큰 배치에서도 키가 작게 유지되도록 함
+        seed_key = ("range", seeds.start, seeds.stop) if isinstance(seeds, range) else tuple(seeds)
+        return engine, file_path, ("SeedBasedWildcardBatch", file_path, seed_key, sampling, cut_cycles, unique)
+
+    @staticmethod
+    def parse_seeds(seed_list):
+        """쉼표/공백/줄바꿈으로 구분된 시드 목록. 숫자가 아니거나 범위(1 ~ 2^64-1) 밖의 값이 있으면 ValueError."""
+        if not seed_list or not seed_list.strip():
+            return []
+        seeds = []
+        for token in re.split(r'[\s,]+', seed_list.strip()):
+            if not token:
+                continue
+            if not re.fullmatch(r'[+-]?[0-9]+', token):
+                raise ValueError(f"seed_list: '{token}' is not a seed; "
+                                 "use whole numbers separated by commas, spaces or new lines")
+            seed = int(token)
+            if not 1 <= seed <= SEED_MAX:
+                raise ValueError(f"seed_list: seed {seed} is out of range (1 to {SEED_MAX})")
+            seeds.append(seed)
+        return seeds
+
+NODE_CLASS_MAPPINGS = {
+    "SeedBasedWildcardBatch": SeedBasedWildcardBatch
+}
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "SeedBasedWildcardBatch": "Seed Based Wildcard (Batch List Output)"
+}
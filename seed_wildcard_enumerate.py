@@ -0,0 +1,68 @@
+from .instrumentation import instrumented, metrics
+from .wildcard_engine import get_engine
+from .wildcard_enumerate import ExpansionSpace
+from .wildcard_graph import TAG_MODES
+
+class SeedWildcardEnumerate:
+    """
+    와일드카드 파일이 만들 수 있는 모든 확장의 수를 세고(큰 정수),
+    start 번째부터 count 개의 확장을 번호 순서대로 샘플링 없이 나열하는 노드.
+    같은 번호는 항상 같은 확장이므로 범위를 나눠 전체를 중복 없이 훑을 수 있습니다.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "wildcard_file": (get_engine().files(), ),
+                "start": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "count": ("INT", {"default": 100, "min": 1, "max": 1000000}),
+            },
+            "optional": {
+                # impact: 경로 포함/대소문자 무시 태그, exact: 정확한 파일명 태그
+                "mode": (sorted(TAG_MODES), {"default": "impact"}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("prompts", "total")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "process"
+    CATEGORY = "Custom/Wildcard"
+
+    @classmethod
+    def IS_CHANGED(s, wildcard_file, start, count, mode="impact"):
+        # 나열하면서 읽은 파일들이 그대로면 같은 값 -> ComfyUI 가 재실행하지 않음
+        # 저장된 결과가 없거나 오래됐으면 나열하지 않고 '바뀜' 으로 보고, 실행에서 새로 계산
+        engine = get_engine(mode=mode)
+        fingerprint = engine.fingerprint(("SeedWildcardEnumerate", engine.file_path(wildcard_file), start, count))
+        return float("nan") if fingerprint is None else fingerprint
+
+    @instrumented("SeedWildcardEnumerate")
+    def process(self, wildcard_file, start, count, mode="impact"):
+        (prompts, total), _ = self.enumerate_cached(wildcard_file, start, count, mode)
+        # 64비트를 넘을 수 있으므로 총 개수는 문자열로 출력
+        return (list(prompts), str(total))
+
+    @staticmethod
+    def enumerate_cached(wildcard_file, start, count, mode="impact"):
+        """((prompts, total), fingerprint). 같은 범위이고 참조한 파일들이 바뀌지 않았으면 다시 세지 않습니다."""
+        engine = get_engine(mode=mode)
+        file_path = engine.file_path(wildcard_file)
+
+        def compute(cut_paths):
+            space = ExpansionSpace(engine.base_dir, mode, load_lines=engine.load_lines)
+            with metrics.phase("SeedWildcardEnumerate.count"):
+                total = space.count_file(file_path)
+            with metrics.phase("SeedWildcardEnumerate.expand"):
+                prompts = tuple(space.iter_file(file_path, start, start + count))
+            return prompts, total
+
+        return engine.cached(("SeedWildcardEnumerate", file_path, start, count), compute)
+
+NODE_CLASS_MAPPINGS = {
+    "SeedWildcardEnumerate": SeedWildcardEnumerate
+}
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "SeedWildcardEnumerate": "Seed Wildcard Enumerate (All Combinations)"
+}
@@ -0,0 +1,42 @@
+from .instrumentation import instrumented
+from .wildcard_graph import TAG_MODES, get_graph
+from .wildcard_index import default_wildcard_dir
+
+class SeedWildcardValidate:
+    """
+    wildcards 폴더 전체의 태그 참조 그래프를 만들어
+    순환 참조, 찾을 수 없는 태그, 최대 확장 깊이를 보고하는 검사 노드.
+    (mode: impact = 경로 포함/대소문자 무시 태그, exact = 예전 Lora 노드의 정확한 파일명 태그)
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "mode": (sorted(TAG_MODES), {"default": "impact"}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "INT", "BOOLEAN")
+    RETURN_NAMES = ("report", "max_depth", "has_problems")
+    FUNCTION = "validate"
+    CATEGORY = "Custom/Wildcard"
+    OUTPUT_NODE = True
+
+    @classmethod
+    def IS_CHANGED(s, mode):
+        # 폴더 구조나 파일 내용이 바뀌었을 때만 다시 검사
+        return get_graph(default_wildcard_dir(), mode).fingerprint
+
+    @instrumented("SeedWildcardValidate")
+    def validate(self, mode):
+        graph = get_graph(default_wildcard_dir(), mode)
+        report = graph.format_report()
+        return {"ui": {"text": [report]}, "result": (report, graph.max_depth, graph.has_problems)}
+
+NODE_CLASS_MAPPINGS = {
+    "SeedWildcardValidate": SeedWildcardValidate
+}
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "SeedWildcardValidate": "Seed Wildcard Validate (Cycles & Missing Tags)"
+}
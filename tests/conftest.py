@@ -0,0 +1,33 @@
+"""
+ComfyUI 없이 이 폴더를 seed_wildcard_pack 패키지로 경로 로드해 테스트합니다 (모듈은 상대 임포트만 사용).
+처음에는 __init__.py 를 실행하지 않고 엔진 모듈만 불러오며, 노드가 필요한 테스트는 package 픽스처를 씁니다.
+디스크 스냅샷은 테스트 폴더에 파일을 남기지 않도록 끕니다.
+"""
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+os.environ["SEED_WILDCARD_SNAPSHOT"] = "0"
+PACKAGE_NAME = "seed_wildcard_pack"
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 폴더 이름에 '-' 가 있어 일반 import 가 안 되므로 경로로 로드 (benchmarks/bench.py 와 같은 방식)
+_spec = importlib.util.spec_from_file_location(
+    PACKAGE_NAME, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR])
+_package = sys.modules[PACKAGE_NAME] = importlib.util.module_from_spec(_spec)
+
+
+@pytest.fixture(scope="session")
+def package(tmp_path_factory):
+    """__init__.py 까지 실행한 패키지 (NODE_CLASS_MAPPINGS 와 노드 모듈). folder_paths 는 스텁으로 대체."""
+    if "folder_paths" not in sys.modules:
+        stub = types.ModuleType("folder_paths")
+        stub.base_path = str(tmp_path_factory.mktemp("comfyui"))
+        stub.get_filename_list = lambda kind: []
+        sys.modules["folder_paths"] = stub
+    if not hasattr(_package, "NODE_CLASS_MAPPINGS"):
+        _spec.loader.exec_module(_package)
+    return _package
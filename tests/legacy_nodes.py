@@ -0,0 +1,143 @@
+"""
+기준 커밋(6550d54)의 SeedBasedWildcardImpact / SeedBasedWildcardLora 로직을 folder_paths 없이 옮긴 것.
+현재 엔진이 기존 노드와 같은 결과를 내는지 비교하는 테스트에서만 사용합니다. (동작을 바꾸지 말 것)
+"""
+import os
+import random
+import re
+
+IMPACT_TAG = r'__([\w\-\s./\\]+)__'
+EXACT_TAG = r'__([\w\-\s]+)__'
+
+
+def load_lines(path):
+    if os.path.exists(path) and os.path.isfile(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return [line.strip() for line in f.readlines() if line.strip()]
+        except Exception:
+            pass
+    return []
+
+
+def wildcard_map(base_dir, exact=False):
+    result = {}
+    if os.path.exists(base_dir):
+        for root, dirs, filenames in os.walk(base_dir):
+            for filename in filenames:
+                if filename.endswith('.txt'):
+                    key = os.path.splitext(filename)[0]
+                    result[key if exact else key.lower()] = os.path.join(root, filename)
+    return result
+
+
+def resolve_wildcards(text, rng, tag_map, exact=False, depth=0):
+    if depth > 20:
+        return text
+
+    original_text = text
+
+    while True:
+        match = re.search(r'\{([^{}]+)\}', text)
+        if not match: break
+        content = match.group(1)
+        segments = content.split('|')
+        options = []
+        weights = []
+        for segment in segments:
+            if '::' in segment:
+                try:
+                    weight_str, val = segment.split('::', 1)
+                    weight = float(weight_str)
+                except ValueError:
+                    weight = 1.0
+                    val = segment
+            else:
+                weight = 1.0
+                val = segment
+            options.append(val)
+            weights.append(weight)
+        try:
+            choice = rng.choices(options, weights=weights, k=1)[0]
+        except ValueError:
+            choice = options[0] if options else ""
+        text = text[:match.start()] + choice + text[match.end():]
+
+    def replace_wildcard(match):
+        if exact:
+            key = match.group(1)
+        else:
+            key = os.path.splitext(os.path.basename(match.group(1)))[0].lower()
+        if key in tag_map:
+            lines = load_lines(tag_map[key])
+            if lines:
+                return rng.choice(lines)
+        return match.group(0)
+
+    text = re.sub(EXACT_TAG if exact else IMPACT_TAG, replace_wildcard, text)
+
+    if text != original_text:
+        return resolve_wildcards(text, rng, tag_map, exact, depth + 1)
+    return text
+
+
+def expand(base_dir, wildcard_file, seed, exact=False):
+    """예전 노드의 process() 와 같은 결과 (Lora 노드는 exact=True, 태그 치환까지)."""
+    lines = load_lines(os.path.join(base_dir, wildcard_file))
+    if not lines:
+        return ""
+    rng = random.Random(seed)
+    return resolve_wildcards(lines[(seed - 1) % len(lines)], rng, wildcard_map(base_dir, exact), exact)
+
+
+def find_best_match_lora(input_name, available_list):
+    normalized_input = input_name.replace("\\", "/").lower()
+    if normalized_input.endswith(".safetensors"):
+        normalized_input = normalized_input[:-12]
+    elif normalized_input.endswith(".pt"):
+        normalized_input = normalized_input[:-3]
+
+    for filename in available_list:
+        normalized_file = filename.replace("\\", "/").lower()
+        file_base = normalized_file
+        if file_base.endswith(".safetensors"):
+            file_base = file_base[:-12]
+        elif file_base.endswith(".pt"):
+            file_base = file_base[:-3]
+        if normalized_input == file_base:
+            return filename
+
+    return None
+
+
+def extract_loras(text, available_loras):
+    lora_stack = []
+    pattern = r"<lora:([^>]+)>"
+
+    for match in re.findall(pattern, text):
+        if not match: continue
+
+        parts = match.split(':')
+        raw_lora_name = parts[0].strip()
+        if not raw_lora_name: continue
+
+        real_lora_name = find_best_match_lora(raw_lora_name, available_loras)
+        final_name = real_lora_name if real_lora_name else raw_lora_name
+
+        model_strength = 1.0
+        clip_strength = 1.0
+        if len(parts) > 1 and parts[1].strip():
+            try:
+                model_strength = float(parts[1])
+                clip_strength = model_strength
+            except: pass
+        if len(parts) > 2 and parts[2].strip():
+            try:
+                clip_strength = float(parts[2])
+            except: pass
+
+        lora_stack.append((final_name, model_strength, clip_strength))
+
+    clean_text = re.sub(pattern, "", text)
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    return lora_stack, clean_text
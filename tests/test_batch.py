@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.fixture
+def parse_seeds(package):
+    return package.seed_wildcard_batch.SeedBasedWildcardBatch.parse_seeds
+
+
+def test_parse_seeds(parse_seeds):
+    assert parse_seeds("") == [] and parse_seeds(" \n ") == []
+    assert parse_seeds("3, 1\n2 ,, 18446744073709551615") == [3, 1, 2, 2 ** 64 - 1]
+
+
+@pytest.mark.parametrize("seed_list, message", [
+    ("1, 2, x", "'x' is not a seed"),
+    ("1; 2", "'1;' is not a seed"),
+    ("1.5", "'1.5' is not a seed"),
+    ("0", "seed 0 is out of range"),
+    ("4, -2", "seed -2 is out of range"),
+    ("18446744073709551616", "out of range"),
+])
+def test_parse_seeds_rejects_bad_tokens(parse_seeds, seed_list, message):
+    with pytest.raises(ValueError, match=message):
+        parse_seeds(seed_list)
@@ -0,0 +1,69 @@
+import os
+
+from seed_wildcard_pack.wildcard_engine import get_engine
+from seed_wildcard_pack.wildcard_enumerate import ExpansionSpace
+
+
+def write_files(base_dir, files):
+    for name, text in files.items():
+        path = os.path.join(base_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def sampled(base_dir, name, seeds=range(1, 300)):
+    engine = get_engine(str(base_dir))
+    path = os.path.join(str(base_dir), name)
+    return set(engine.expand_seeds(path, list(seeds)))
+
+
+def test_line_past_depth_limit_stays_literal(tmp_path):
+    # f18 부터 {} 그룹이 있는 25단계 체인: f21 은 MAX_DEPTH 를 넘어 삽입되므로 그룹/태그 모두 그대로 남음
+    write_files(tmp_path, {f"f{i}.txt": (f"{{a|b}}{i} __f{i + 1}__" if i >= 18 else f"x{i} __f{i + 1}__")
+                           for i in range(25)})
+    space = ExpansionSpace(str(tmp_path))
+    path = os.path.join(str(tmp_path), "f0.txt")
+    assert space.count_file(path) == 8
+    assert space.expand_file(path, 0).endswith("a18 a19 a20 {a|b}21 __f22__")
+    assert sampled(tmp_path, "f0.txt") <= set(space.iter_file(path))
+
+
+def test_negative_weights_follow_sampler(tmp_path):
+    # 누적 가중치 [1, 0, 1] 에서 bisect 는 항상 마지막 선택지만 고름
+    write_files(tmp_path, {"main.txt": "{1::a|-1::b|1::c}\n{2::x|0::y|1::z}\n{-1::p|1::q}"})
+    space = ExpansionSpace(str(tmp_path))
+    path = os.path.join(str(tmp_path), "main.txt")
+    enumerated = set(space.iter_file(path))
+    assert enumerated == {"c", "x", "z", "p"}
+    assert sampled(tmp_path, "main.txt") == enumerated
+
+
+def test_sampled_outputs_are_enumerated(tmp_path):
+    write_files(tmp_path, {
+        "main.txt": "__color__ hair, {short|long|2::curly} cut\n{a|{b|c}} __Color__, __sub/Shade__\n__hair__ {x|y}",
+        "color.txt": "red\n{light|dark} green\n__sub/shade__ blue",
+        "sub/shade.txt": "pale\n{soft|vivid}",
+    })
+    space = ExpansionSpace(str(tmp_path))
+    path = os.path.join(str(tmp_path), "main.txt")
+    enumerated = list(space.iter_file(path))
+    assert len(enumerated) == space.count_file(path)
+    assert sampled(tmp_path, "main.txt") <= set(enumerated)
+
+
+def test_cached_enumeration_depends_on_touched_files(tmp_path):
+    write_files(tmp_path, {"main.txt": "{a|b} __color__", "color.txt": "red\nblue", "other.txt": "x"})
+    engine = get_engine(str(tmp_path))
+    path = os.path.join(str(tmp_path), "main.txt")
+
+    def enumerate_cached():
+        space = ExpansionSpace(str(tmp_path), load_lines=engine.load_lines)
+        return engine.cached(("enumerate", path), lambda cut_paths: tuple(space.iter_file(path)))
+
+    prompts, fingerprint = enumerate_cached()
+    assert prompts == ("a red", "a blue", "b red", "b blue")
+    write_files(tmp_path, {"other.txt": "changed"})
+    assert enumerate_cached()[1] == fingerprint
+    write_files(tmp_path, {"color.txt": "green"})
+    assert enumerate_cached() != (prompts, fingerprint)
@@ -0,0 +1,64 @@
+import os
+
+from seed_wildcard_pack.wildcard_cache import line_cache
+from seed_wildcard_pack.wildcard_engine import get_engine
+from seed_wildcard_pack.wildcard_graph import build_graph, get_graph
+
+
+def write(path, text, mtime_ns):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_freshness_check_is_limited_to_reachable_files(tmp_path, monkeypatch):
+    base_dir = str(tmp_path)
+    main, a, b, other = (os.path.join(base_dir, name + ".txt") for name in ("main", "a", "b", "other"))
+    write(main, "start __a__", 10 ** 18)
+    write(a, "a __b__", 10 ** 18)
+    write(b, "b __a__", 10 ** 18)
+    write(other, "other", 10 ** 18)
+    engine = get_engine(base_dir)
+
+    cut_paths, fingerprint = engine.cycle_cut(True, main)
+    assert cut_paths == {a, b}
+    graph = get_graph(base_dir, "impact")
+
+    stat_calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *args, **kwargs: stat_calls.append(path) or real_stat(path, *args, **kwargs))
+    # 닿지 않는 파일의 변경은 확인하지 않고, 닿는 파일만 stat
+    write(other, "other changed", 2 * 10 ** 18)
+    assert get_graph(base_dir, "impact", main) is graph
+    assert other not in stat_calls and main in stat_calls
+
+    # 닿는 파일이 바뀌면 다시 만들고, 순환이 사라졌으므로 fingerprint 도 바뀜
+    write(b, "b", 2 * 10 ** 18)
+    cut_paths, new_fingerprint = engine.cycle_cut(True, main)
+    assert get_graph(base_dir, "impact") is not graph
+    assert not cut_paths and new_fingerprint != fingerprint
+    assert engine.expand(os.path.join(base_dir, "main.txt"), 1, cut_paths=cut_paths) == "start a b"
+
+
+def test_cycles_are_cut_on_re_entry(tmp_path):
+    base_dir = str(tmp_path)
+    main, a, b = (os.path.join(base_dir, name + ".txt") for name in ("main", "a", "b"))
+    write(main, "start __a__, __b__", 10 ** 18)
+    write(a, "a __b__", 10 ** 18)
+    write(b, "{b|B} __a__", 10 ** 18)
+    engine = get_engine(base_dir)
+    cut_paths, _ = engine.cycle_cut(True, main)
+    assert cut_paths == {a, b}
+    # 순환 파일도 처음 들어갈 때는 펼치고, 같은 경로에서 다시 들어가는 태그만 남김
+    results = {engine.expand(main, seed, cut_paths=cut_paths) for seed in range(1, 20)}
+    assert results == {f"start a {x} __a__, {y} a __b__" for x in "bB" for y in "bB"}
+    assert engine.expand(b, 1, cut_paths=cut_paths) in ("b a __b__", "B a __b__")
+
+
+def test_build_graph_does_not_fill_line_cache(tmp_path):
+    base_dir = str(tmp_path)
+    write(os.path.join(base_dir, "main.txt"), "__a__", 10 ** 18)
+    write(os.path.join(base_dir, "a.txt"), "a", 10 ** 18)
+    graph = build_graph(base_dir)
+    assert graph.edges == {os.path.join(base_dir, "main.txt"): (os.path.join(base_dir, "a.txt"),)}
+    assert line_cache.peek(os.path.join(base_dir, "a.txt")) is None
@@ -0,0 +1,27 @@
+import os
+
+from seed_wildcard_pack import wildcard_index
+from seed_wildcard_pack.wildcard_index import get_index, rescan
+
+
+def test_watch_is_opt_in(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(wildcard_index.WildcardIndex, "start_watcher", lambda self: started.append(self) or True)
+    monkeypatch.delenv("SEED_WILDCARD_WATCH", raising=False)
+    get_index(str(tmp_path / "a"))
+    assert not started
+    monkeypatch.setenv("SEED_WILDCARD_WATCH", "1")
+    index = get_index(str(tmp_path / "b"))
+    assert started == [index]
+
+
+def test_rescan_picks_up_new_files(tmp_path):
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    index = get_index(str(tmp_path))
+    assert index.files == ["a.txt"]
+    stat = os.stat(tmp_path)
+    (tmp_path / "b.txt").write_text("b", encoding="utf-8")
+    # 폴더 mtime 이 바뀌지 않은 것처럼 되돌리면 refresh() 로는 보이지 않지만 rescan() 은 새 파일을 찾음
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert get_index(str(tmp_path)).files == ["a.txt"]
+    assert rescan(str(tmp_path)).files == ["a.txt", "b.txt"]
@@ -0,0 +1,79 @@
+"""
+무작위 와일드카드 폴더에서 공유 엔진과 lora_tags 가 기존 노드(legacy_nodes)와 같은 결과를 내는지 비교합니다.
+(sampling="compatible" 의 가중치 선택이 rng.choices 와 바이트 단위로 같은지도 여기서 확인됩니다)
+"""
+import os
+import random
+
+import pytest
+
+import legacy_nodes
+from seed_wildcard_pack import lora_tags
+from seed_wildcard_pack.wildcard_engine import get_engine
+
+TOKENS = ["{", "}", "|", "::", "a", "b", "2", "0", "-1", "1.5", " ", ",", "__", "__t1__", "__T2__", "__sub/t3__",
+          "__t1__ __t2__", "x", "_", "nan", "inf", "\\", "{|}", "{}", "<lora:foo:0.5>", "<lora:Foo>"]
+FILES = ["t1.txt", "T2.txt", "sub/t3.txt", "main.txt"]
+SEEDS = range(1, 15)
+
+
+def assert_same_loras(text, available_loras):
+    """
+    기존 파서와 같은 스택/텍스트. 단, 기존에 찾지 못해 원래 이름을 쓰던 LoRA 는
+    이후 추가된 파일명/구두점 무시 매칭(find_best_match_lora)으로 찾을 수 있으면 그 결과를 씁니다.
+    """
+    stack, clean_text = lora_tags.parse_lora_tags(text, available_loras, warn=False)
+    legacy_stack, legacy_text = legacy_nodes.extract_loras(text, available_loras)
+    assert clean_text == legacy_text, repr(text)
+    assert len(stack) == len(legacy_stack), repr(text)
+    for (name, model, clip), (legacy_name, legacy_model, legacy_clip) in zip(stack, legacy_stack):
+        if legacy_name not in available_loras:
+            legacy_name = lora_tags.find_best_match_lora(legacy_name, available_loras) or legacy_name
+        assert (name, repr(model), repr(clip)) == (legacy_name, repr(legacy_model), repr(legacy_clip)), repr(text)
+
+
+def random_tree(base_dir, rng):
+    os.makedirs(os.path.join(base_dir, "sub"))
+    for name in FILES:
+        lines = ("".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 14))) for _ in range(rng.randint(1, 5)))
+        with open(os.path.join(base_dir, name), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+
+# (다른 시드는 자기 자신을 여러 번 참조하는 줄이 생겨 기존 해석기가 2^20 배로 커지는 폴더를 만들 수 있음)
+@pytest.mark.parametrize("trial_seed", [0, 1])
+def test_engine_matches_legacy_nodes(tmp_path, trial_seed):
+    rng = random.Random(trial_seed)
+    available_loras = ["foo.safetensors", "a.safetensors"]
+    for trial in range(30):
+        base_dir = str(tmp_path / str(trial))
+        random_tree(base_dir, rng)
+        main = os.path.join(base_dir, "main.txt")
+        for mode, exact in (("impact", False), ("exact", True)):
+            expected = [legacy_nodes.expand(base_dir, "main.txt", seed, exact) for seed in SEEDS]
+            engine = get_engine(base_dir, mode)
+            assert engine.expand_seeds(main, SEEDS) == expected
+            assert [engine.expand(main, seed) for seed in SEEDS] == expected
+            # 경로 추적(순환 끊기용) 자체는 결과를 바꾸지 않음: 끊을 파일이 경로에 없으면 같은 결과
+            assert engine.expand_seeds(main, SEEDS, cut_paths=frozenset({"<none>"})) == expected
+        # Lora 노드: exact 태그 규칙 + LoRA 추출
+        for text in expected:
+            assert_same_loras(text, available_loras)
+
+
+def test_lora_parser_matches_legacy():
+    rng = random.Random(0)
+    tokens = ["\x1c", "\x85", "　", "​", "\xa0", "<lora:", ">", "a", "b", ":", "0.5", "x", "1", "nan",
+              " ", "  ", "\t", "\n", "<", "lora", "1e3", ",", "<lora:foo>", "<lora::1>", "<lora: :>"]
+    available_loras = ["foo.safetensors", "a.safetensors"]
+    for _ in range(20000):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 12)))
+        assert_same_loras(text, available_loras)
+
+
+def test_unmatched_lora_is_logged(caplog):
+    with caplog.at_level("WARNING", logger="SeedWildcardPack"):
+        stack, _ = lora_tags.parse_lora_tags("x <lora:missing:0.5>", ["foo.safetensors"])
+    assert stack == [("missing", 0.5, 0.5)]
+    assert [r.getMessage() for r in caplog.records] == [
+        "[SeedWildcardLora] Could not find strict match for Lora 'missing'. Trying raw name."]
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from seed_wildcard_pack import wildcard_mmap
+from seed_wildcard_pack.wildcard_mmap import MappedLines, UnsupportedFile
+
+
+@pytest.fixture(autouse=True)
+def sidecar_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEED_WILDCARD_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def text_mode_lines(path):
+    # WildcardLineCache 가 작은 파일에 쓰는 방식
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_bytes(tmp_path, data, name="big.txt"):
+    path = str(tmp_path / name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+@pytest.mark.parametrize("data", [
+    b"a\nb\n\n  c  \n",
+    b"a\r\nb\r\n\r\n  \r\nlast",
+    "﻿bom first\nsecond\n".encode("utf-8"),
+    # 유니코드 공백만 있는 줄은 비어있는 줄, 공백이 아닌 문자가 섞이면 그대로
+    "　\n\x85\xa0\n x \n\x1c\x1f\né\nあ\n한글 줄\n​\n".encode("utf-8"),
+    b"",
+    b"\n\n \n",
+])
+def test_matches_text_mode_reader(tmp_path, data):
+    path = write_bytes(tmp_path, data)
+    assert list(MappedLines(path, os.stat(path))) == text_mode_lines(path)
+
+
+def test_lines_spanning_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(wildcard_mmap, "_BLOCK_SIZE", 7)
+    monkeypatch.setattr(wildcard_mmap, "_FLUSH_PAIRS", 2)
+    data = "".join(f"line {i} あ{'x' * (i % 9)}\r\n" + ("\n" if i % 4 == 0 else "") for i in range(200))
+    path = write_bytes(tmp_path, data.encode("utf-8"))
+    lines = MappedLines(path, os.stat(path))
+    assert len(lines) == 200
+    assert list(lines) == text_mode_lines(path)
+    assert lines[-1] == lines[199] == text_mode_lines(path)[-1]
+
+
+@pytest.mark.parametrize("data", [b"a\rb\n", b"ok\n\xff\xfe\n", b"tail\r"])
+def test_unsupported_files(tmp_path, data):
+    path = write_bytes(tmp_path, data)
+    with pytest.raises(UnsupportedFile):
+        MappedLines(path, os.stat(path))
+
+
+def test_truncated_file_does_not_crash(tmp_path):
+    path = write_bytes(tmp_path, b"".join(b"line %d\n" % i for i in range(1000)))
+    lines = MappedLines(path, os.stat(path))
+    with open(path, "r+b") as f:
+        f.truncate(10)
+    # 예전처럼 원본을 mmap 해 두면 여기서 SIGBUS
+    assert lines[999] == ""
+    assert lines[0] == "line 0"
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from seed_wildcard_pack import wildcard_prefetch
+from seed_wildcard_pack.wildcard_cache import line_cache
+from seed_wildcard_pack.wildcard_graph import TAG_MODES
+from seed_wildcard_pack.wildcard_prefetch import prefetch
+
+
+@pytest.fixture
+def chain(tmp_path, monkeypatch):
+    # a -> b -> c
+    monkeypatch.setattr(wildcard_prefetch, "prefetch_threads", 2)
+    files = {"a": "x __b__", "b": "y __c__", "c": "z"}
+    paths = {}
+    for name, text in files.items():
+        path = paths[name] = str(tmp_path / f"{name}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    yield paths, {TAG_MODES["impact"][1](name): path for name, path in paths.items()}
+    for path in paths.values():
+        line_cache.invalidate(path)
+
+
+def test_walks_past_cached_levels(chain):
+    paths, tag_map = chain
+    line_cache.get_lines(paths["a"])
+    assert prefetch(["__a__"], tag_map) == 2
+    assert line_cache.peek(paths["c"]) is not None
+    assert prefetch(["__a__"], tag_map) == 0
+
+
+def test_reloads_stale_files(chain):
+    paths, tag_map = chain
+    prefetch(["__a__"], tag_map)
+    with open(paths["b"], "w", encoding="utf-8") as f:
+        f.write("y __c__, changed")
+    st = os.stat(paths["b"])
+    os.utime(paths["b"], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert prefetch(["__a__"], tag_map) == 1
+    assert line_cache.peek(paths["b"])[1] == ("y __c__, changed",)
@@ -0,0 +1,72 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("numpy")
+
+
+def make_image(batch=3, height=40, width=48, seed=0):
+    # uint8 로 표현 가능한 값만 사용 (opencv 경로의 양자화와 비교하기 위해)
+    generator = torch.Generator().manual_seed(seed)
+    return torch.randint(0, 256, (batch, height, width, 3), generator=generator).float() / 255.0
+
+
+@pytest.fixture
+def node(package):
+    return package.resize_by_scale.ResizeByScale()
+
+
+def test_torch_backend_shape_and_range(node):
+    image = make_image()
+    (out,) = node.resize(image, "Lanczos", 32, 24, 2.0, False, "torch")
+    assert out.shape == (3, 3, 48, 64) and out.dtype == torch.float32
+    assert float(out.min()) >= 0.0 and float(out.max()) <= 1.0
+
+
+def test_torch_backend_crop_is_centered(node):
+    image = make_image()
+    (full,) = node.resize(image, "Bilinear", 32, 24, 1.5, False, "torch")
+    (cropped,) = node.resize(image, "Bilinear", 32, 24, 1.5, True, "torch")
+    assert cropped.shape == (3, 3, 24, 32) and cropped.is_contiguous()
+    assert torch.equal(cropped, full[:, :, 6:30, 8:40])
+    # 결과가 기준 크기보다 작으면 자르지 않음
+    (small,) = node.resize(image, "Bilinear", 32, 24, 0.8, True, "torch")
+    assert small.shape == (3, 3, 19, 25)
+
+
+@pytest.mark.parametrize("method", ["Bilinear", "Bicubic"])
+def test_torch_backend_matches_opencv(node, method):
+    # 확대에서는 antialias 가 영향이 없으므로 두 경로의 차이는 opencv 의 uint8 고정소수점/양자화 오차뿐
+    image = make_image()
+    (expected,) = node.resize(image, method, 40, 30, 2.0, True, "opencv")
+    (out,) = node.resize(image, method, 40, 30, 2.0, True, "torch")
+    assert out.shape == expected.shape
+    diff = (out - expected).abs()
+    assert float(diff.max()) <= 4 / 255
+    assert float(diff.mean()) <= 1 / 255
+
+
+def stacked_opencv(node, image, method, width, height, base_width, base_height, crop):
+    """미리 할당하기 전의 opencv 경로: 프레임별 텐서를 만든 뒤 torch.stack."""
+    import cv2
+
+    interpolation = {"Lanczos": cv2.INTER_LANCZOS4, "Bicubic": cv2.INTER_CUBIC,
+                     "Bilinear": cv2.INTER_LINEAR, "Nearest": cv2.INTER_NEAREST}[method]
+    frames = []
+    for img in image:
+        resized = cv2.resize(node.convert_to_numpy(img), (width, height), interpolation=interpolation)
+        if crop and width >= base_width and height >= base_height:
+            start_x = (width - base_width) // 2
+            start_y = (height - base_height) // 2
+            resized = resized[start_y:start_y + base_height, start_x:start_x + base_width]
+        frames.append(torch.from_numpy(resized.transpose(2, 0, 1)).float() / 255.0)
+    return torch.stack(frames)
+
+
+@pytest.mark.parametrize("method", ["Lanczos", "Bicubic", "Bilinear", "Nearest"])
+@pytest.mark.parametrize("crop", [False, True])
+@pytest.mark.parametrize("threads", [1, 0, 3])
+def test_preallocated_opencv_output_matches_stacked(node, method, crop, threads):
+    image = make_image(batch=5, seed=1)
+    (out,) = node.resize(image, method, 40, 30, 1.5, crop, "opencv", threads)
+    assert torch.equal(out, stacked_opencv(node, image, method, 60, 45, 40, 30, crop))
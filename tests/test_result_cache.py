@@ -0,0 +1,47 @@
+import os
+
+from seed_wildcard_pack.result_cache import ResultCache
+
+
+def _compute(cache, path, value, calls):
+    def compute():
+        calls.append(value)
+        cache.record(path)
+        return value
+    return compute
+
+
+def test_byte_budget_evicts_old_results(tmp_path):
+    path = str(tmp_path / "a.txt")
+    with open(path, "w") as f:
+        f.write("a")
+    cache = ResultCache(maxsize=100, max_bytes=20000)
+    calls = []
+    big = tuple("x" * 1000 + str(i) for i in range(8))  # 약 8.4 KB
+    for key in range(3):
+        cache.get_or_compute(key, 0, _compute(cache, path, big, calls))
+    assert cache._total_bytes <= cache.max_bytes
+    assert list(cache._entries) == [1, 2]
+    cache.get_or_compute(2, 0, _compute(cache, path, big, calls))
+    assert len(calls) == 3
+
+
+def test_oversized_result_keeps_only_fingerprint(tmp_path):
+    path = str(tmp_path / "a.txt")
+    with open(path, "w") as f:
+        f.write("a")
+    cache = ResultCache(maxsize=100, max_bytes=1000)
+    calls = []
+    huge = tuple("y" * 100 + str(i) for i in range(100))
+    value, fingerprint = cache.get_or_compute("k", 0, _compute(cache, path, huge, calls))
+    assert value is huge and cache._total_bytes == 0
+    # 값은 보관하지 않지만 fingerprint 는 계산 없이 확인 가능
+    assert cache.fingerprint("k", 0) == fingerprint
+    assert cache.get_or_compute("k", 0, _compute(cache, path, huge, calls)) == (huge, fingerprint)
+    assert len(calls) == 2
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert cache.fingerprint("k", 0) is None
+    assert cache.fingerprint("k", 1) is None
+    assert cache.fingerprint("other", 0) is None
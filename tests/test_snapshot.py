@@ -0,0 +1,53 @@
+import os
+
+from seed_wildcard_pack import wildcard_snapshot
+from seed_wildcard_pack.wildcard_engine import get_engine
+from seed_wildcard_pack.wildcard_index import get_index
+from seed_wildcard_pack.wildcard_template import TAG_PATTERN, template_cache
+
+
+def test_snapshot_keeps_only_line_templates(tmp_path, monkeypatch):
+    # 스냅샷 파일은 SEED_WILDCARD_CACHE_DIR 아래에 만들어 테스트 폴더를 건드리지 않음
+    monkeypatch.setenv("SEED_WILDCARD_CACHE_DIR", str(tmp_path / "cache"))
+    base_dir = tmp_path / "wildcards"
+    base_dir.mkdir()
+    (base_dir / "main.txt").write_text("{red|blue|green} __shape__\nplain {a|b|c|d}\n", encoding="utf-8")
+    (base_dir / "shape.txt").write_text("{round|square} box\ncircle\n", encoding="utf-8")
+    engine = get_engine(str(base_dir))
+    path = os.path.join(str(base_dir), "main.txt")
+    index = get_index(str(base_dir))
+
+    engine.expand_seeds(path, range(1, 50))
+    assert wildcard_snapshot.save(index, force=True)
+    # 같은 줄들에서 다른 시드만 해석하면 저장할 내용이 바뀌지 않음
+    engine.expand_seeds(path, range(50, 500))
+    template_cache.get("not a line {x|y}", TAG_PATTERN)
+    assert not wildcard_snapshot.save(index)
+
+    lines, templates = wildcard_snapshot._contents(index)
+    texts = {text for _, _, file_lines in lines for text in file_lines}
+    assert templates and all(template.text in texts for _, template in templates)
+
+
+def test_save_is_scheduled_after_warm_up(tmp_path, monkeypatch):
+    monkeypatch.setenv("SEED_WILDCARD_CACHE_DIR", str(tmp_path / "cache"))
+    base_dir = tmp_path / "wildcards"
+    base_dir.mkdir()
+    (base_dir / "main.txt").write_text("{red|blue} __shape__\n", encoding="utf-8")
+    (base_dir / "shape.txt").write_text("box\n", encoding="utf-8")
+    index = get_index(str(base_dir))
+    # 테스트에서는 스냅샷이 꺼져 있으므로 attach() 가 했을 등록만 흉내냄
+    monkeypatch.setitem(wildcard_snapshot._attached, index.base_dir, index)
+    monkeypatch.setitem(wildcard_snapshot._checked_state, index.base_dir, wildcard_snapshot._quick_state(index))
+    monkeypatch.setattr(wildcard_snapshot, "save_delay", 0.05)
+    saved = []
+    monkeypatch.setattr(wildcard_snapshot, "save", lambda index, force=False: saved.append(index))
+
+    engine = get_engine(str(base_dir))
+    engine.expand_seeds(os.path.join(str(base_dir), "main.txt"), range(1, 5))
+    timer = wildcard_snapshot._pending[index.base_dir]
+    timer.join(5)
+    assert saved == [index] and index.base_dir not in wildcard_snapshot._pending
+    # 바뀐 내용이 없으면 다시 예약하지 않음
+    engine.expand_seeds(os.path.join(str(base_dir), "main.txt"), range(5, 9))
+    assert not wildcard_snapshot.schedule_save(index)
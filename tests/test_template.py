@@ -0,0 +1,82 @@
+import os
+import random
+from collections import Counter
+
+import legacy_nodes
+from seed_wildcard_pack.wildcard_engine import get_engine
+from seed_wildcard_pack.wildcard_template import build_alias_table, compile_template, scratch_cache, template_cache
+
+
+def write_files(base_dir, files):
+    for name, text in files.items():
+        with open(os.path.join(base_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def expand_both(base_dir, seeds=range(1, 40)):
+    path = os.path.join(str(base_dir), "main.txt")
+    expected = [legacy_nodes.expand(str(base_dir), "main.txt", seed) for seed in seeds]
+    assert get_engine(str(base_dir)).expand_seeds(path, seeds) == expected
+    return expected
+
+
+def test_inserted_lines_reuse_line_templates(tmp_path):
+    write_files(tmp_path, {"main.txt": "__subj__, __style__",
+                           "subj.txt": "\n".join(f"subject {i} {{red|blue}} hair" for i in range(50)),
+                           "style.txt": "{" + "|".join(f"{i % 5 + 1}::style{i}" for i in range(30)) + "}"})
+    expand_both(tmp_path)
+    scratch_before = len(scratch_cache.items())
+    expand_both(tmp_path, range(40, 200))
+    # 태그로 삽입된 줄은 파일 줄 템플릿으로 캐시되고, 시드마다 중간 텍스트를 다시 파싱하지 않음
+    assert len(scratch_cache.items()) == scratch_before
+    assert any(text.startswith("{1::style0") for text, _, _ in template_cache.items())
+
+
+def test_groups_formed_across_inserted_lines(tmp_path):
+    # 삽입된 줄의 중괄호/밑줄이 앞뒤 텍스트와 이어져 새 그룹이나 태그를 만드는 경우는 합쳐서 다시 파싱
+    write_files(tmp_path, {"main.txt": "{x|y} {a|__open__|c}} _\n__open__ z}\n_{a|_}tag__ __close__",
+                           "open.txt": "{b|d\n{p|q}|{r",
+                           "close.txt": "s}\n_tag__\n__",
+                           "tag.txt": "T{1|2}"})
+    results = expand_both(tmp_path, range(1, 200))
+    assert len(set(results)) > 3
+
+
+def alias_probabilities(prob, alias):
+    # 칸 i 를 1/n 로 고르고, prob[i] 면 i, 아니면 alias[i]
+    n = len(prob)
+    result = [0.0] * n
+    for i in range(n):
+        result[i] += prob[i] / n
+        result[alias[i]] += (1.0 - prob[i]) / n
+    return result
+
+
+def test_alias_table_matches_weights():
+    rng = random.Random(0)
+    for n in (1, 2, 3, 7, 300):
+        weights = [rng.choice([0.0, 0.5, 1.0, 2.0, rng.uniform(0, 9)]) for _ in range(n)]
+        weights[0] = 1.0
+        total = sum(weights)
+        probabilities = alias_probabilities(*build_alias_table(weights))
+        assert all(abs(p - w / total) < 1e-12 for p, w in zip(probabilities, weights))
+
+
+def test_alias_sampling_distribution():
+    choice = compile_template("{1::a|0::b|2::c|5::d|0.5::e}").items[0]
+    assert choice.alias_ok
+    rng = random.Random(1)
+    draws = 200000
+    counts = Counter(choice.evaluate(rng, alias=True)[0] for _ in range(draws))
+    assert counts["b"] == 0
+    for value, weight in zip("acde", (1, 2, 5, 0.5)):
+        expected = draws * weight / 8.5
+        # 표준편차의 5배 이내
+        assert abs(counts[value] - expected) < 5 * (expected * (1 - weight / 8.5)) ** 0.5
+
+
+def test_negative_weights_fall_back_to_bisect():
+    choice = compile_template("{1::a|-1::b|1::c}").items[0]
+    assert not choice.alias_ok
+    assert {choice.evaluate(random.Random(seed), alias=True)[0] for seed in range(200)} == \
+        {choice.evaluate(random.Random(seed))[0] for seed in range(200)}
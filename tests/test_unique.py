@@ -0,0 +1,23 @@
+from seed_wildcard_pack import wildcard_unique
+from seed_wildcard_pack.wildcard_unique import UniqueFilter, reset_sessions, session_filter
+
+
+def test_session_filters_are_bounded(monkeypatch):
+    monkeypatch.setattr(wildcard_unique, "max_sessions", 2)
+    reset_sessions()
+    first = session_filter("a")
+    session_filter("b")
+    assert session_filter("a") is first  # "a" 를 최근에 썼으므로 "b" 가 먼저 밀려남
+    session_filter("c")
+    assert session_filter("a") is first
+    assert len(wildcard_unique._session_filters) == 2
+    assert reset_sessions() == 2
+    assert session_filter("a") is not first
+
+
+def test_pick_prefers_unseen_alternatives():
+    unique = UniqueFilter(100)
+    expand = lambda seed, attempt=0: f"{(seed + attempt) % 3}"
+    picked = [unique.pick(expand, seed) for seed in (1, 1, 1, 1)]
+    assert picked[:3] == ["1", "2", "0"] and picked[3] == "1"
+    assert unique.duplicates == 3 and unique.exhausted == 1
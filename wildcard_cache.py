@@ -0,0 +1,153 @@
+import os
+import stat
+import sys
+import threading
+from collections import OrderedDict
+
+from .instrumentation import metrics
+from .wildcard_mmap import MappedLines, UnsupportedFile
+
+# 기본 캐시 용량 (MB). 환경변수 SEED_WILDCARD_CACHE_MB 로 조정 가능
+DEFAULT_CACHE_MB = 64
+# 이 크기 이상의 파일은 통째로 읽지 않고 디스크의 줄 오프셋 인덱스로 필요한 줄만 읽음 (SEED_WILDCARD_MMAP_MB, 0 = 사용 안 함)
+DEFAULT_MMAP_MB = 16
+
+
+class WildcardLineCache:
+    """
+    와일드카드 .txt 파일의 '정제된 줄 목록'을 프로세스 전역으로 보관하는 LRU 캐시.
+    - 키: 파일 경로 / 검증: (mtime_ns, size) 가 바뀌면 다시 읽음
+    - 값: strip() 후 빈 줄을 제외한 줄들의 tuple (list보다 작고 불변)
+    - 용량: 줄 데이터의 추정 바이트 합계가 max_bytes 를 넘으면 오래된 항목부터 제거
+    - mmap_threshold 이상의 큰 파일은 MappedLines(디스크 줄 오프셋 인덱스, 줄 단위로 읽기) 로 보관
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024, mmap_threshold=DEFAULT_MMAP_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self._entries = OrderedDict()  # path -> (signature, lines, nbytes)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.version = 0  # 파일을 새로 읽을 때마다 증가
+
+    def get_lines(self, path):
+        """
+        경로의 줄 목록을 반환합니다. 파일이 없거나 일반 파일이 아니면 빈 tuple.
+        읽기/디코딩 오류는 호출 측에서 처리하도록 그대로 전달합니다.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.invalidate(path)
+            return ()
+        if not stat.S_ISREG(st.st_mode):
+            return ()
+
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                if metrics.enabled:
+                    metrics.incr("cache.hits")
+                return entry[1]
+
+        if self.mmap_threshold and st.st_size >= self.mmap_threshold:
+            try:
+                lines = MappedLines(path, st)
+            except UnsupportedFile:
+                lines = None
+            if lines is not None:
+                self._store(path, signature, lines, sys.getsizeof(lines))
+                return lines
+
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = tuple(line.strip() for line in f if line.strip())
+
+        if metrics.enabled:
+            metrics.incr("cache.misses")
+            metrics.incr("cache.bytes_read", st.st_size)
+        self._store(path, signature, lines, _tuple_bytes(lines))
+        self.version += 1
+        return lines
+
+    def peek(self, path):
+        """캐시에 있는 (signature, lines) 를 stat 없이 반환합니다 (없으면 None, 최신 여부는 검증하지 않음)."""
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        return entry[0], entry[1]
+
+    def _store(self, path, signature, lines, nbytes):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            # 단일 파일이 예산보다 크면 캐시하지 않음 (다른 항목을 모두 밀어내지 않도록)
+            if nbytes > self.max_bytes:
+                return
+            self._entries[path] = (signature, lines, nbytes)
+            self._total_bytes += nbytes
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self._total_bytes -= nbytes
+
+    def export(self, prefix):
+        """prefix 아래 경로의 (path, signature, lines) 목록 (오래된 것부터, mmap 항목 제외)."""
+        with self._lock:
+            return [(path, signature, lines) for path, (signature, lines, _) in self._entries.items()
+                    if isinstance(lines, tuple) and path.startswith(prefix)]
+
+    def preload(self, entries):
+        """
+        export() 결과를 캐시에 없는 경로만 채워 넣습니다.
+        signature 는 다음 get_lines() 에서 파일의 현재 (mtime_ns, size) 와 비교되므로 오래된 값은 자동으로 무시됩니다.
+        """
+        for path, signature, lines in entries:
+            with self._lock:
+                if path in self._entries:
+                    continue
+            self._store(path, tuple(signature), lines, _tuple_bytes(lines))
+
+    def invalidate(self, path=None):
+        """특정 경로(또는 path=None 이면 전체)를 캐시에서 제거합니다."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _tuple_bytes(lines):
+    return sys.getsizeof(lines) + sum(map(sys.getsizeof, lines))
+
+
+def _megabytes_from_env(name, default):
+    try:
+        return int(float(os.environ.get(name, default)) * 1024 * 1024)
+    except ValueError:
+        return default * 1024 * 1024
+
+
+# 두 와일드카드 노드가 공유하는 프로세스 전역 캐시
+line_cache = WildcardLineCache(_megabytes_from_env("SEED_WILDCARD_CACHE_MB", DEFAULT_CACHE_MB),
+                               _megabytes_from_env("SEED_WILDCARD_MMAP_MB", DEFAULT_MMAP_MB))
@@ -0,0 +1,208 @@
+"""
+와일드카드 노드들이 공유하는 엔진.
+
+폴더 인덱스(wildcard_index), 줄 캐시(wildcard_cache), 컴파일된 템플릿(wildcard_template),
+결과 캐시(result_cache), 선행 로딩(wildcard_prefetch)을 한 곳에서 묶어
+"파일 + 시드 -> 확장된 텍스트" 를 제공합니다. 엔진은 (폴더, 태그 규칙) 마다 프로세스에 하나만 만들어지고
+상태는 모두 프로세스 전역 캐시에 있으므로, 노드 인스턴스 수가 늘어도 스캔/메모리 비용은 늘지 않습니다.
+"""
+import os
+import random
+import threading
+
+from . import wildcard_snapshot
+from .instrumentation import logger, metrics
+from .result_cache import result_cache
+from .wildcard_cache import line_cache
+from .wildcard_graph import TAG_MODES, get_graph
+from .wildcard_index import default_wildcard_dir, get_index
+from .wildcard_prefetch import prefetch
+from .wildcard_template import resolve
+from .wildcard_unique import UniqueFilter, session_filter
+
+NO_FILES = "no_txt_files_found.txt"
+
+_NO_CUT = frozenset()
+
+
+class WildcardEngine:
+    """
+    한 wildcards 폴더와 태그 규칙(mode)에 대한 확장 엔진.
+    - impact: __경로/이름__ 허용, 대소문자 무시 (Impact Pack 과 동일, 기본값)
+    - exact: 경로 없는 태그, 대소문자 구분 (예전 Lora 노드 규칙)
+    """
+
+    def __init__(self, base_dir, mode="impact"):
+        self.base_dir = base_dir
+        self.mode = mode
+        self.tag_re, self.tag_key, self._map_name = TAG_MODES[mode]
+
+    def index(self):
+        """공유 인덱스 (바뀐 폴더만 다시 읽음)."""
+        return get_index(self.base_dir)
+
+    def files(self):
+        """INPUT_TYPES 용 파일 목록."""
+        return list(self.index().files) or [NO_FILES]
+
+    def file_path(self, wildcard_file):
+        return os.path.join(self.base_dir, wildcard_file)
+
+    def load_lines(self, path):
+        # 결과 캐시 검증을 위해 읽은 파일을 기록하고, 오류는 빈 목록으로 처리
+        result_cache.record(path)
+        try:
+            return line_cache.get_lines(path)
+        except Exception as e:
+            logger.warning("[SeedWildcard] Error reading %s: %s", path, e)
+        return ()
+
+    def cycle_cut(self, cut_cycles, file_path=None):
+        """
+        (순환에 속한 파일 집합, fingerprint). cut_cycles 가 아니면 (빈 집합, None).
+        이 파일들로 다시 들어가는 태그만 make_lookup 이 경로를 보고 끊습니다.
+        file_path 를 주면 그 파일에서 닿는 파일만 확인하고, fingerprint 도 그 범위의 순환 파일로만 만듭니다.
+        """
+        if not cut_cycles:
+            return _NO_CUT, None
+        graph = get_graph(self.base_dir, self.mode, file_path)
+        if file_path is None:
+            return graph.cyclic, graph.fingerprint
+        return graph.cyclic, graph.cut_fingerprint(file_path)
+
+    def make_lookup(self, tag_map, cut_paths=_NO_CUT):
+        """
+        resolve() 용 lookup. cut_paths (순환에 속한 파일들) 가 비어있지 않으면 경로를 추적하는 lookup(tag, chain) 을
+        반환합니다: 지금 해석 중인 경로(chain)에 이미 있는 파일로 다시 들어가는 태그만 리터럴로 남깁니다.
+        chain 에는 순환에 속한 파일만 기록합니다 (그 밖의 파일로는 다시 들어갈 수 없음).
+        """
+        tag_key = self.tag_key
+        load_lines = self.load_lines
+
+        if not cut_paths:
+            def lookup(tag):
+                target_path = tag_map.get(tag_key(tag))
+                if target_path is None:
+                    return ()
+                return load_lines(target_path)
+
+            return lookup
+
+        def lookup_on_path(tag, chain):
+            target_path = tag_map.get(tag_key(tag))
+            if target_path is None or target_path in chain:
+                return (), chain
+            if target_path in cut_paths:
+                chain = chain | {target_path}
+            return load_lines(target_path), chain
+
+        return lookup_on_path
+
+    def _expander(self, file_path, lines, tag_map, sampling, cut_paths):
+        lookup = self.make_lookup(tag_map, cut_paths)
+        tag_re = self.tag_re
+        n = len(lines)
+        origin = None
+        if cut_paths:
+            origin = frozenset((file_path,)) if file_path in cut_paths else frozenset()
+
+        def expand_one(seed, attempt=0):
+            # attempt > 0 은 중복 회피용 대체 시도 (attempt 0 = 일반 결과)
+            return resolve(lines[(seed - 1 + attempt) % n], random.Random(seed + (attempt << 64)), lookup, tag_re,
+                           sampling=sampling, origin=origin)
+
+        return expand_one
+
+    def bind(self, file_path, sampling="compatible", cut_paths=_NO_CUT):
+        """
+        파일의 줄과 태그 맵을 한 번만 가져와 (seed, attempt=0) -> 텍스트 함수를 반환합니다.
+        (대량 생성용: 시드마다 인덱스를 확인하지 않으므로 폴더 변경은 반영되지 않음)
+        """
+        tag_map = getattr(self.index(), self._map_name)
+        lines = self.load_lines(file_path)
+        if not lines:
+            return lambda seed, attempt=0: ""
+        return self._expander(file_path, lines, tag_map, sampling, cut_paths)
+
+    def expand_seeds(self, file_path, seeds, sampling="compatible", cut_paths=_NO_CUT, unique=None):
+        """
+        시드마다 줄 하나를 고르고(시드 1 = 첫 줄) 같은 시드로 {a|b}/__tag__ 를 해석한 결과 목록.
+        unique(UniqueFilter) 를 주면 이미 나온 결과 대신 같은 시드의 다음 대체 시도를 사용합니다.
+        """
+        index = self.index()
+        tag_map = getattr(index, self._map_name)
+        lines = self.load_lines(file_path)
+        if not lines:
+            return ["" for _ in seeds]
+
+        n = len(lines)
+        # 참조하는 파일들을 해석 전에 한 번에 병렬로 읽어 둠
+        prefetch({lines[(seed - 1) % n] for seed in seeds}, tag_map, self.mode)
+        expand_one = self._expander(file_path, lines, tag_map, sampling, cut_paths)
+        with metrics.phase("wildcard.resolve"):
+            if unique is None:
+                results = [expand_one(seed) for seed in seeds]
+            else:
+                results = [unique.pick(expand_one, seed) for seed in seeds]
+        # 새로 읽거나 컴파일한 내용이 있으면 잠시 뒤 스냅샷 저장 (종료 시에만 저장하면 kill 에서 잃음)
+        wildcard_snapshot.schedule_save(index)
+        return results
+
+    def expand(self, file_path, seed, sampling="compatible", cut_paths=_NO_CUT, unique=None):
+        return self.expand_seeds(file_path, (seed,), sampling, cut_paths, unique)[0]
+
+    def unique_filter(self, scope, file_path, count=None, owner=None):
+        """
+        scope: off -> None / run -> 이번 실행 전용 필터 /
+        session -> (노드 종류, 폴더, 태그 규칙, 파일) 별로 재시작 전까지 유지되는 필터.
+        """
+        if scope == "run":
+            return UniqueFilter(count)
+        if scope == "session":
+            return session_filter((owner, self.base_dir, self.mode, file_path))
+        return None
+
+    def expand_session_unique(self, owner, file_path, seeds, sampling="compatible", cut_cycles=False):
+        """세션 필터를 쓰는 확장. 호출할 때마다 결과가 달라지므로 결과 캐시를 거치지 않습니다."""
+        cut_paths, _ = self.cycle_cut(cut_cycles, file_path)
+        unique = self.unique_filter("session", file_path, owner=owner)
+        return self.expand_seeds(file_path, seeds, sampling, cut_paths, unique)
+
+    def cached(self, key, compute, cut_cycles=False, extra=None, file_path=None):
+        """
+        compute(cut_paths) 의 결과를 결과 캐시에 보관합니다. (value, fingerprint) 를 반환.
+        재사용 조건: 인덱스 generation, 계산 중 읽은 파일들, extra, (cut_cycles 이면) 순환 파일 집합이 모두 같을 때.
+        file_path: 해석을 시작하는 파일 (순환 확인을 이 파일에서 닿는 범위로 제한)
+        """
+        index = self.index()
+        cut_paths, graph_fingerprint = self.cycle_cut(cut_cycles, file_path)
+        result = result_cache.get_or_compute((self.base_dir, self.mode) + tuple(key), index.generation,
+                                             lambda: compute(cut_paths), extra=(extra, graph_fingerprint))
+        wildcard_snapshot.schedule_save(index)
+        return result
+
+    def fingerprint(self, key, cut_cycles=False, extra=None, file_path=None):
+        """
+        cached() 에 저장된 결과의 fingerprint 를 계산 없이 반환합니다. 유효한 결과가 없으면 None.
+        (큰 배치의 IS_CHANGED 가 fingerprint 를 얻으려고 전체를 해석하지 않도록)
+        """
+        generation = self.index().generation
+        _, graph_fingerprint = self.cycle_cut(cut_cycles, file_path)
+        return result_cache.fingerprint((self.base_dir, self.mode) + tuple(key), generation,
+                                        extra=(extra, graph_fingerprint))
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(base_dir=None, mode="impact"):
+    """(폴더, 태그 규칙) 별 프로세스 전역 엔진 (기본값: Impact Pack wildcards 폴더)."""
+    if base_dir is None:
+        base_dir = default_wildcard_dir()
+    key = (base_dir, mode)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = WildcardEngine(base_dir, mode)
+    return engine
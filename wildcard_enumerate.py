@@ -0,0 +1,244 @@
+"""
+와일드카드 줄이 만들 수 있는 모든 확장을 세고, 번호(index) 순서대로 나열하는 API.
+
+확장 공간은 구조적으로 정의됩니다.
+- 줄 = 리터럴 / {} 그룹 / __tag__ 의 연속 -> 각 부분의 경우의 수를 곱함 (마지막 부분이 가장 빨리 바뀌는 혼합 기수)
+- {} 그룹 = 선택지들의 합. 샘플링(random.choices 의 누적 가중치 bisect)이 실제로 고를 수 있는 선택지만 포함
+  (가중치 0 인 선택지, 음수 가중치 때문에 누적 배열에서 도달할 수 없는 선택지는 제외. 합이 0 이하면 첫 선택지만)
+- __tag__ = 대상 파일 각 줄의 경우의 수의 합 (파일이 없으면 태그 그대로 1가지)
+- MAX_DEPTH 단계를 넘어 삽입된 줄은 해석이 완전히 멈추므로 {} 그룹과 태그를 포함해 줄 전체가 리터럴 1가지
+경우의 수는 파이썬 정수(big int)로 계산하므로 실제 확장을 만들지 않고 셀 수 있고,
+0 <= i < count 인 모든 i 가 서로 다른 선택 경로에 대응하므로 [start, stop) 범위로 나눠 여러 머신에서 중복 없이 처리할 수 있습니다.
+{} 그룹으로 조립되는 태그(__color_{red|blue}__)처럼 해석 도중에 생기는 구문과,
+선택 결과가 빈 문자열이라 샘플링에서는 중괄호째 남는 그룹({{|}} 등)은 공간에 포함되지 않습니다.
+(서로 다른 선택 경로가 같은 문자열이 될 수는 있습니다.)
+"""
+import math
+import os
+from bisect import bisect, bisect_right
+from itertools import accumulate
+
+from .wildcard_cache import line_cache
+from .wildcard_graph import TAG_MODES
+from .wildcard_index import get_index
+from .wildcard_template import MAX_DEPTH, Choice, compile_template
+
+_TAG = 0
+_GROUP = 1
+
+
+def _strip_weight(segment):
+    # 'w::값' 접두사 분리 (parse_segment 와 같은 규칙, 첫 리터럴에 있는 경우만)
+    if segment and isinstance(segment[0], str) and '::' in segment[0]:
+        weight_str, rest = segment[0].split('::', 1)
+        try:
+            return float(weight_str), (rest,) + tuple(segment[1:])
+        except ValueError:
+            pass
+    return 1.0, tuple(segment)
+
+
+def _reachable(cum_weights):
+    """
+    _choose 가 실제로 반환할 수 있는 선택지 번호들.
+    bisect(cum_weights, x, 0, n - 1) 는 x 가 누적 값 중 하나를 지날 때만 바뀌므로
+    x 의 범위 [0, total) 를 누적 값으로 나눈 각 구간의 왼쪽 끝만 확인하면 됩니다.
+    """
+    total = cum_weights[-1] + 0.0
+    if total <= 0.0 or not math.isfinite(total):
+        # 샘플링도 가중치 합이 잘못되면 항상 첫 선택지 (_choose 와 동일)
+        return [0]
+    hi = len(cum_weights) - 1
+    points = {0.0}
+    points.update(c for c in cum_weights if 0.0 < c < total)
+    return sorted({bisect(cum_weights, x, 0, hi) for x in points})
+
+
+def _read_lines(path):
+    try:
+        return line_cache.get_lines(path)
+    except Exception:
+        return ()
+
+
+class ExpansionSpace:
+    """
+    한 시점의 wildcards 폴더에 대한 확장 공간. 경우의 수와 누적 합은 (텍스트/파일, 깊이) 별로 캐시됩니다.
+    파일이 바뀌면 새 인스턴스를 만들어야 합니다.
+    mode: "impact" (경로 포함, 대소문자 무시 태그) / "exact" (정확한 파일명 태그)
+    load_lines: 경로 -> 줄 목록 (기본값: 줄 캐시, 읽기 오류는 빈 목록). 엔진의 load_lines 를 주면 읽은 파일이 결과 캐시에 기록됩니다.
+    """
+
+    def __init__(self, base_dir=None, mode="impact", max_depth=MAX_DEPTH, load_lines=None):
+        self.index = get_index(base_dir)
+        self.load_lines = load_lines or _read_lines
+        self.tag_re, self.tag_key, map_name = TAG_MODES[mode]
+        self.tag_map = getattr(self.index, map_name)
+        self.max_depth = max_depth
+        self._parts = {}        # 줄 텍스트 -> 부분 tuple
+        self._line_counts = {}  # (줄 텍스트, depth) -> 경우의 수
+        self._prefix = {}       # (파일 경로, depth) -> (줄 목록, 누적 경우의 수)
+
+    # --- 구조 ---
+
+    def _compile(self, text):
+        parts = self._parts.get(text)
+        if parts is None:
+            parts = self._parts[text] = self._convert(compile_template(text, self.tag_re).items)
+        return parts
+
+    def _convert(self, items):
+        parts = []
+        for item in items:
+            if isinstance(item, Choice):
+                weighted = [_strip_weight(segment) for segment in item.segments]
+                options = [weighted[i][1] for i in _reachable(list(accumulate(weight for weight, _ in weighted)))]
+                parts.append((_GROUP, tuple(self._convert(option) for option in options)))
+                continue
+            last = 0
+            for m in self.tag_re.finditer(item):
+                if m.start() > last:
+                    parts.append(item[last:m.start()])
+                parts.append((_TAG, m.group(1), m.group(0)))
+                last = m.end()
+            if last < len(item):
+                parts.append(item[last:])
+        return tuple(parts)
+
+    def _tag_path(self, tag):
+        return self.tag_map.get(self.tag_key(tag))
+
+    def _file_prefix(self, path, depth):
+        key = (path, depth)
+        entry = self._prefix.get(key)
+        if entry is None:
+            lines = self.load_lines(path)
+            prefix = list(accumulate(self._count_line(line, depth) for line in lines))
+            entry = self._prefix[key] = (lines, prefix)
+        return entry
+
+    # --- 경우의 수 ---
+
+    def _line_parts(self, text, depth):
+        # resolve() 는 depth > max_depth 인 단계를 실행하지 않으므로 그 깊이의 줄은 통째로 리터럴
+        if depth > self.max_depth:
+            return (text,)
+        return self._compile(text)
+
+    def _count_line(self, text, depth):
+        if depth > self.max_depth:
+            return 1
+        key = (text, depth)
+        count = self._line_counts.get(key)
+        if count is None:
+            count = self._line_counts[key] = self._count_parts(self._compile(text), depth)
+        return count
+
+    def _count_part(self, part, depth):
+        if isinstance(part, str):
+            return 1
+        if part[0] == _GROUP:
+            return sum(self._count_parts(option, depth) for option in part[1])
+        return self._count_tag(part[1], depth)
+
+    def _count_parts(self, parts, depth):
+        total = 1
+        for part in parts:
+            if not isinstance(part, str):
+                total *= self._count_part(part, depth)
+        return total
+
+    def _count_tag(self, tag, depth):
+        path = self._tag_path(tag)
+        if path is None:
+            return 1
+        prefix = self._file_prefix(path, depth + 1)[1]
+        return prefix[-1] if prefix else 1
+
+    # --- index -> 확장 ---
+
+    def _render_parts(self, parts, depth, index, out):
+        counts = [self._count_part(part, depth) for part in parts]
+        digits = [0] * len(parts)
+        for i in range(len(parts) - 1, -1, -1):
+            index, digits[i] = divmod(index, counts[i])
+        for part, digit in zip(parts, digits):
+            if isinstance(part, str):
+                out.append(part)
+            elif part[0] == _GROUP:
+                for option in part[1]:
+                    option_count = self._count_parts(option, depth)
+                    if digit < option_count:
+                        self._render_parts(option, depth, digit, out)
+                        break
+                    digit -= option_count
+            else:
+                self._render_tag(part, depth, digit, out)
+
+    def _render_tag(self, part, depth, index, out):
+        _, tag, raw = part
+        path = self._tag_path(tag)
+        if path is None:
+            out.append(raw)
+            return
+        lines, prefix = self._file_prefix(path, depth + 1)
+        if not prefix:
+            out.append(raw)
+            return
+        line_no = bisect_right(prefix, index)
+        offset = index - (prefix[line_no - 1] if line_no else 0)
+        self._render_parts(self._line_parts(lines[line_no], depth + 1), depth + 1, offset, out)
+
+    # --- 공개 API ---
+
+    def count_line(self, text):
+        """한 줄이 만들 수 있는 확장의 수."""
+        return self._count_line(text, 0)
+
+    def expand_line(self, text, index):
+        """한 줄의 index 번째 확장 (0 <= index < count_line(text))."""
+        count = self.count_line(text)
+        if not 0 <= index < count:
+            raise IndexError(f"expansion index {index} out of range (0..{count - 1})")
+        out = []
+        self._render_parts(self._compile(text), 0, index, out)
+        return "".join(out)
+
+    def count_file(self, path):
+        """파일 모든 줄의 확장 수 합 (줄 순서대로 이어 붙인 공간)."""
+        prefix = self._file_prefix(path, 0)[1]
+        return prefix[-1] if prefix else 0
+
+    def expand_file(self, path, index):
+        lines, prefix = self._file_prefix(path, 0)
+        if not 0 <= index < (prefix[-1] if prefix else 0):
+            raise IndexError(f"expansion index {index} out of range for {path}")
+        line_no = bisect_right(prefix, index)
+        offset = index - (prefix[line_no - 1] if line_no else 0)
+        out = []
+        self._render_parts(self._compile(lines[line_no]), 0, offset, out)
+        return "".join(out)
+
+    def iter_file(self, path, start=0, stop=None):
+        """[start, stop) 범위의 확장을 index 순서대로 생성합니다. (메모리 사용량은 범위와 무관)"""
+        total = self.count_file(path)
+        stop = total if stop is None else min(stop, total)
+        for index in range(start, stop):
+            yield self.expand_file(path, index)
+
+
+def shard_bounds(total, shard, shards):
+    """[0, total) 을 shards 개로 나눈 shard 번째 (start, stop). 모든 shard 를 합치면 겹침 없이 전체를 덮습니다."""
+    if not 0 <= shard < shards:
+        raise ValueError("shard must be in [0, shards)")
+    return total * shard // shards, total * (shard + 1) // shards
+
+
+def count_expansions(wildcard_file, base_dir=None, mode="impact"):
+    index = get_index(base_dir)
+    return ExpansionSpace(base_dir, mode).count_file(os.path.join(index.base_dir, wildcard_file))
+
+
+def iter_expansions(wildcard_file, start=0, stop=None, base_dir=None, mode="impact"):
+    index = get_index(base_dir)
+    return ExpansionSpace(base_dir, mode).iter_file(os.path.join(index.base_dir, wildcard_file), start, stop)
@@ -0,0 +1,341 @@
+"""
+와일드카드 폴더 전체의 태그 참조 그래프.
+
+각 파일의 줄에 적힌 __tag__ 를 노드와 같은 규칙으로 파일에 연결해
+- 순환 참조 (Tarjan SCC: 크기가 2 이상이거나 자기 자신을 참조하는 파일 묶음)
+- 찾을 수 없는 태그
+- 최대 확장 깊이 (순환에 닿는 파일은 깊이 없음)
+를 해석 전에 미리 알려 줍니다. {} 그룹으로 조립되는 태그(예: __color_{red|blue}__)는 정적으로 알 수 없어 제외됩니다.
+
+    python wildcard_graph.py --wildcards <wildcards 폴더> [--mode impact|exact] [--json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+
+if __name__ == "__main__" and not __package__:
+    # 스크립트로 실행한 경우: 폴더를 패키지로 경로 로드해 (__init__.py 는 실행하지 않음) 그 안의 main 을 실행
+    import importlib.util
+
+    _package_dir = os.path.dirname(os.path.abspath(__file__))
+    _spec = importlib.util.spec_from_file_location(
+        "seed_wildcard_pack", os.path.join(_package_dir, "__init__.py"), submodule_search_locations=[_package_dir])
+    sys.modules["seed_wildcard_pack"] = importlib.util.module_from_spec(_spec)
+    from seed_wildcard_pack.wildcard_graph import main
+    sys.exit(main())
+
+from .wildcard_cache import line_cache
+from .wildcard_index import get_index
+from .wildcard_template import MAX_DEPTH, SIMPLE_TAG_PATTERN, TAG_PATTERN
+
+
+def impact_tag_key(tag):
+    # Impact Pack 과 같은 규칙 (경로 제거, 확장자 제거, 소문자)
+    return os.path.splitext(os.path.basename(tag))[0].lower()
+
+
+def exact_tag_key(tag):
+    # 예전 SeedBasedWildcardLora 규칙: 경로 없는 태그, 대소문자를 유지한 파일명 그대로 조회
+    return tag
+
+
+# mode -> (태그 정규식, 태그 -> 키 함수, 사용할 인덱스 맵 이름)
+TAG_MODES = {
+    "impact": (TAG_PATTERN, impact_tag_key, "tag_map"),
+    "exact": (SIMPLE_TAG_PATTERN, exact_tag_key, "exact_tag_map"),
+}
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def strongly_connected_components(nodes, edges):
+    """Tarjan 알고리즘 (재귀 없이). edges: node -> 후속 node 들. 역위상 순서로 SCC 목록을 반환합니다."""
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index_of:
+            continue
+        work = [(root, iter(edges.get(root, ())))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for succ in successors:
+                if succ not in index_of:
+                    index_of[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(edges.get(succ, ()))))
+                    advanced = True
+                    break
+                if succ in on_stack and index_of[succ] < lowlink[node]:
+                    lowlink[node] = index_of[succ]
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+class TagGraph:
+    """
+    파일 경로를 노드로 하는 태그 참조 그래프.
+    - edges: 파일 -> 참조하는 파일들 / unresolved: 파일 -> 찾을 수 없는 태그들
+    - cycles: 순환 SCC 목록 / cyclic: 순환에 속한 파일 집합
+    - depth: 파일 -> 참조를 따라간 최대 단계 수 (참조 없음 = 0, 순환에 닿으면 None)
+    """
+
+    def __init__(self, base_dir, mode, files, edges, unresolved, errors, generation, signatures):
+        self.base_dir = base_dir
+        self.mode = mode
+        self.files = files
+        self.edges = edges
+        self.unresolved = unresolved
+        self.errors = errors
+        self.generation = generation
+        self.signatures = signatures
+        self.fingerprint = hashlib.sha1(
+            repr((generation, sorted(signatures.items()))).encode("utf-8", "surrogatepass")).hexdigest()
+        self._reachable = {}
+        self._cut_fingerprints = {}
+        self._line_version = line_cache.version
+
+        components = strongly_connected_components(files, edges)
+        self.cycles = [sorted(c) for c in components if len(c) > 1 or c[0] in edges.get(c[0], ())]
+        self.cyclic = frozenset(path for c in self.cycles for path in c)
+
+        # SCC 는 역위상 순서(후속 파일이 먼저)이므로 한 번의 순회로 깊이 계산
+        self.depth = {}
+        for component in components:
+            if component[0] in self.cyclic:
+                for path in component:
+                    self.depth[path] = None
+                continue
+            path = component[0]
+            depth = 0
+            for succ in edges.get(path, ()):
+                succ_depth = self.depth[succ]
+                if succ_depth is None:
+                    depth = None
+                    break
+                depth = max(depth, succ_depth + 1)
+            self.depth[path] = depth
+
+    def reachable(self, path):
+        """path 와 path 에서 태그로 닿을 수 있는 파일들 (정적으로 알 수 있는 참조만)."""
+        found = self._reachable.get(path)
+        if found is None:
+            seen = {path}
+            stack = [path]
+            while stack:
+                for succ in self.edges.get(stack.pop(), ()):
+                    if succ not in seen:
+                        seen.add(succ)
+                        stack.append(succ)
+            found = self._reachable[path] = frozenset(seen)
+        return found
+
+    def cut_fingerprint(self, path):
+        """path 에서 닿는 파일 중 순환에 속한 것들만으로 만든 값 (다른 파일의 변경에는 바뀌지 않음)."""
+        fingerprint = self._cut_fingerprints.get(path)
+        if fingerprint is None:
+            fingerprint = self._cut_fingerprints[path] = hashlib.sha1(
+                repr(sorted(self.cyclic & self.reachable(path))).encode("utf-8", "surrogatepass")).hexdigest()
+        return fingerprint
+
+    def is_current(self, path=None):
+        """
+        인덱스와 파일들의 (mtime_ns, size) 가 만들 때와 같으면 True.
+        path 를 주면 path 에서 닿는 파일만 stat 하고, 나머지는 줄 캐시가 새로 읽은 파일이 있을 때만
+        캐시에 기록된 signature 와 비교합니다 (stat 없음). path 가 없으면 모든 파일을 stat 합니다.
+        """
+        index = get_index(self.base_dir)
+        if index.generation != self.generation:
+            return False
+        if path is None:
+            return all(_signature(p) == signature for p, signature in self.signatures.items())
+        signatures = self.signatures
+        if not all(_signature(p) == signatures.get(p) for p in self.reachable(path)):
+            return False
+        version = line_cache.version
+        if version != self._line_version:
+            for p, signature in signatures.items():
+                cached = line_cache.peek(p)
+                if cached is not None and tuple(cached[0]) != signature:
+                    return False
+            self._line_version = version
+        return True
+
+    @property
+    def max_depth(self):
+        return max((d for d in self.depth.values() if d is not None), default=0)
+
+    def report(self):
+        rel = lambda path: os.path.relpath(path, self.base_dir)
+        return {
+            "base_dir": self.base_dir,
+            "mode": self.mode,
+            "files": len(self.files),
+            "references": sum(len(targets) for targets in self.edges.values()),
+            "max_depth": self.max_depth,
+            "cycles": [[rel(path) for path in cycle] for cycle in self.cycles],
+            "reaches_cycle": sorted(rel(path) for path, d in self.depth.items()
+                                    if d is None and path not in self.cyclic),
+            # 태그 단계 하나가 해석 한 단계이므로 MAX_DEPTH 를 넘으면 반쯤 해석된 텍스트가 나옴
+            "too_deep": sorted(rel(path) for path, d in self.depth.items() if d is not None and d >= MAX_DEPTH),
+            "unresolved": {rel(path): list(tags) for path, tags in sorted(self.unresolved.items())},
+            "errors": {rel(path): message for path, message in sorted(self.errors.items())},
+        }
+
+    def format_report(self):
+        data = self.report()
+        out = [f"{data['files']} files, {data['references']} references, max depth {data['max_depth']} ({data['mode']} tags)"]
+        if data["cycles"]:
+            out.append(f"cycles ({len(data['cycles'])}):")
+            out.extend("  " + " <-> ".join(cycle) for cycle in data["cycles"])
+        if data["reaches_cycle"]:
+            out.append(f"files reaching a cycle ({len(data['reaches_cycle'])}):")
+            out.extend("  " + path for path in data["reaches_cycle"])
+        if data["too_deep"]:
+            out.append(f"files nested {MAX_DEPTH}+ levels ({len(data['too_deep'])}):")
+            out.extend("  " + path for path in data["too_deep"])
+        if data["unresolved"]:
+            out.append(f"unresolved tags ({sum(map(len, data['unresolved'].values()))}):")
+            out.extend(f"  {path}: " + ", ".join(f"__{tag}__" for tag in tags)
+                       for path, tags in data["unresolved"].items())
+        if data["errors"]:
+            out.append(f"unreadable files ({len(data['errors'])}):")
+            out.extend(f"  {path}: {message}" for path, message in data["errors"].items())
+        if len(out) == 1:
+            out.append("no problems found")
+        return "\n".join(out)
+
+    @property
+    def has_problems(self):
+        return bool(self.cycles or self.unresolved or self.errors
+                    or any(d is not None and d >= MAX_DEPTH for d in self.depth.values()))
+
+
+def _scan_tags(path, signature, tag_re):
+    """
+    파일에 적힌 태그들. 줄 캐시에 최신 내용이 있으면 그것을 쓰고, 없으면 캐시에 넣지 않고 한 줄씩 훑습니다.
+    (폴더 전체 검사가 해석에 쓰이는 줄 캐시의 작업 집합을 밀어내지 않도록)
+    """
+    tags = set()
+    if signature is None:
+        return tags  # 인덱스 이후 지워진 파일 (해석에서도 빈 파일로 취급)
+    entry = line_cache.peek(path)
+    if entry is not None and tuple(entry[0]) == signature and isinstance(entry[1], tuple):
+        for line in entry[1]:
+            if "__" in line:
+                tags.update(tag_re.findall(line))
+        return tags
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if "__" in line:
+                tags.update(tag_re.findall(line.strip()))
+    return tags
+
+
+def build_graph(base_dir=None, mode="impact"):
+    index = get_index(base_dir)
+    tag_re, tag_key, map_name = TAG_MODES[mode]
+    tag_map = getattr(index, map_name)
+    generation = index.generation
+
+    files = []
+    edges = {}
+    unresolved = {}
+    errors = {}
+    signatures = {}
+    for rel_path in index.files:
+        path = os.path.join(index.base_dir, rel_path)
+        files.append(path)
+        signatures[path] = _signature(path)
+        try:
+            tags = _scan_tags(path, signatures[path], tag_re)
+        except Exception as e:
+            errors[path] = str(e)
+            continue
+        targets = set()
+        missing = set()
+        for tag in tags:
+            target = tag_map.get(tag_key(tag))
+            if target is None:
+                missing.add(tag)
+            else:
+                targets.add(target)
+        if targets:
+            edges[path] = tuple(sorted(targets))
+        if missing:
+            unresolved[path] = tuple(sorted(missing))
+    return TagGraph(index.base_dir, mode, files, edges, unresolved, errors, generation, signatures)
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_graph(base_dir=None, mode="impact", path=None):
+    """
+    (base_dir, mode) 별로 캐시된 그래프. 인덱스나 파일이 바뀌었으면 다시 만듭니다.
+    path 를 주면 그 파일에서 닿는 파일들만 stat 해서 확인합니다 (TagGraph.is_current 참고).
+    """
+    key = (base_dir, mode)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+    if graph is not None and graph.is_current(path):
+        return graph
+    graph = build_graph(base_dir, mode)
+    with _graphs_lock:
+        _graphs[key] = graph
+    return graph
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cycles, unresolved tags and nesting depth of a wildcard folder.")
+    parser.add_argument("--wildcards", required=True, help="wildcards folder (ComfyUI-Impact-Pack/wildcards)")
+    parser.add_argument("--mode", choices=sorted(TAG_MODES), default="impact",
+                        help="tag rules: 'impact' (paths, case-insensitive) or 'exact' (legacy Lora node rules)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    graph = build_graph(args.wildcards, args.mode)
+    if args.json:
+        print(json.dumps(graph.report(), ensure_ascii=False, indent=2))
+    else:
+        print(graph.format_report())
+    return 1 if graph.has_problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
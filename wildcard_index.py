@@ -0,0 +1,250 @@
+import os
+import threading
+
+from . import wildcard_snapshot
+from .instrumentation import logger, metrics
+
+
+def default_wildcard_dir():
+    """ComfyUI-Impact-Pack 의 wildcards 폴더 경로 (folder_paths 는 필요할 때만 임포트)."""
+    import folder_paths
+    return os.path.join(folder_paths.base_path, "custom_nodes", "ComfyUI-Impact-Pack", "wildcards")
+
+
+def watch_enabled():
+    """환경변수 SEED_WILDCARD_WATCH=1 이면 인덱스를 만들 때 watchdog 감시를 시작합니다 (기본값: 끔)."""
+    return os.environ.get("SEED_WILDCARD_WATCH", "0").lower() in ("1", "true", "yes", "on")
+
+
+class WildcardIndex:
+    """
+    wildcards 폴더의 .txt 파일 목록과 태그 -> 경로 맵을 한 번만 만들어 두고,
+    이후에는 디렉터리 mtime 을 비교해 '바뀐 폴더만' 다시 읽는 증분 인덱스.
+    (선택) watchdog 이 설치되어 있으면 파일 시스템 이벤트가 있을 때만 mtime 검사를 수행합니다.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        # dir_path -> (mtime_ns, [txt 파일명], [하위 폴더 경로])  (os.walk 와 같은 scandir 순서 유지)
+        self._dirs = {}
+        self.files = []          # base_dir 기준 상대 경로, 정렬됨
+        self.tag_map = {}        # 소문자 파일명(확장자 제외) -> 전체 경로
+        self.exact_tag_map = {}  # 대소문자 유지 파일명(확장자 제외) -> 전체 경로
+        self.generation = 0      # 맵이 바뀔 때마다 증가
+        self._lock = threading.RLock()
+        self._scanned = False
+        self._observer = None
+        self._dirty = True
+
+    # --- 스캔 ---
+
+    def _scan_dir(self, path):
+        """한 폴더만 읽어 _dirs 에 기록하고, 새 하위 폴더 목록을 반환합니다."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            filenames = []
+            subdirs = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # os.walk(followlinks=False) 와 동일하게 심볼릭 링크 폴더는 따라가지 않음
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.txt'):
+                        filenames.append(entry.name)
+        except OSError:
+            self._drop_dir(path)
+            return []
+        self._dirs[path] = (mtime, filenames, subdirs)
+        return subdirs
+
+    def _scan_tree(self, path):
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            pending.extend(self._scan_dir(current))
+
+    def _drop_dir(self, path):
+        entry = self._dirs.pop(path, None)
+        if entry is not None:
+            for sub in entry[2]:
+                self._drop_dir(sub)
+
+    def _rebuild(self):
+        files = []
+        tag_map = {}
+        exact_tag_map = {}
+        # os.walk 와 같은 top-down 순서로 순회 (중복 태그는 나중에 나온 파일이 우선)
+        pending = [self.base_dir] if self.base_dir in self._dirs else []
+        while pending:
+            current = pending.pop()
+            _, filenames, subdirs = self._dirs[current]
+            for filename in filenames:
+                full_path = os.path.join(current, filename)
+                files.append(os.path.relpath(full_path, self.base_dir))
+                key = os.path.splitext(filename)[0]
+                exact_tag_map[key] = full_path
+                tag_map[key.lower()] = full_path
+            pending.extend(reversed([d for d in subdirs if d in self._dirs]))
+        files.sort()
+        self.files = files
+        self.tag_map = tag_map
+        self.exact_tag_map = exact_tag_map
+        self.generation += 1
+
+    # --- 공개 API ---
+
+    def refresh(self):
+        """바뀐 폴더만 다시 읽습니다. 변경이 있었으면 True."""
+        with metrics.phase("index.refresh"), self._lock:
+            if not self._scanned:
+                return self.rescan()
+            if self._observer is not None and not self._dirty:
+                return False
+            self._dirty = False
+
+            if not os.path.isdir(self.base_dir):
+                if not self._dirs:
+                    return False
+                self._dirs.clear()
+                self._rebuild()
+                return True
+
+            changed = False
+            if self.base_dir not in self._dirs:
+                self._scan_tree(self.base_dir)
+                changed = True
+            for path in list(self._dirs):
+                entry = self._dirs.get(path)
+                if entry is None:
+                    continue  # 상위 폴더 재스캔 과정에서 이미 제거됨
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    self._drop_dir(path)
+                    changed = True
+                    continue
+                if mtime == entry[0]:
+                    continue
+                if metrics.enabled:
+                    metrics.incr("index.dirs_rescanned")
+                old_subdirs = set(entry[2])
+                new_subdirs = self._scan_dir(path)
+                for sub in old_subdirs.difference(new_subdirs):
+                    self._drop_dir(sub)
+                for sub in new_subdirs:
+                    if sub not in old_subdirs:
+                        self._scan_tree(sub)
+                changed = True
+
+            if changed:
+                self._rebuild()
+            return changed
+
+    def rescan(self):
+        """강제로 전체 폴더를 다시 읽습니다."""
+        if metrics.enabled:
+            metrics.incr("index.full_rescans")
+        with self._lock:
+            self._dirs.clear()
+            if os.path.isdir(self.base_dir):
+                self._scan_tree(self.base_dir)
+            self._rebuild()
+            self._scanned = True
+            self._dirty = False
+            return True
+
+    def export_state(self):
+        """스냅샷 저장용 폴더 상태 (아직 스캔하지 않았으면 None)."""
+        with self._lock:
+            if not self._scanned:
+                return None
+            return {path: (mtime, tuple(filenames), tuple(subdirs))
+                    for path, (mtime, filenames, subdirs) in self._dirs.items()}
+
+    def restore(self, dirs):
+        """
+        스냅샷의 폴더 상태로 시작합니다 (아직 스캔하지 않은 경우만).
+        다음 refresh() 가 폴더 mtime 을 비교해 바뀐 폴더만 다시 읽습니다.
+        """
+        with self._lock:
+            if self._scanned:
+                return False
+            self._dirs = {path: (mtime, list(filenames), list(subdirs))
+                          for path, (mtime, filenames, subdirs) in dirs.items()}
+            self._rebuild()
+            self._scanned = True
+            self._dirty = True
+            return True
+
+    def start_watcher(self):
+        """
+        watchdog 이 설치되어 있으면 파일 시스템 이벤트 감시를 시작합니다.
+        이후 refresh() 는 이벤트가 있었을 때만 mtime 검사를 합니다. 성공하면 True.
+        """
+        with self._lock:
+            if self._observer is not None:
+                return True
+            if not os.path.isdir(self.base_dir):
+                return False
+            try:
+                from watchdog.events import FileSystemEventHandler
+                from watchdog.observers import Observer
+            except ImportError:
+                return False
+
+            index = self
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    index._dirty = True
+
+            observer = Observer()
+            observer.schedule(_Handler(), self.base_dir, recursive=True)
+            observer.daemon = True
+            observer.start()
+            self._observer = observer
+            self._dirty = True
+            return True
+
+    def stop_watcher(self):
+        with self._lock:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer = None
+            self._dirty = True
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(base_dir=None, refresh=True):
+    """
+    base_dir 별 프로세스 전역 인덱스를 반환합니다 (기본값: Impact Pack wildcards 폴더).
+    처음 만들 때 디스크 스냅샷이 있으면 불러옵니다.
+    """
+    if base_dir is None:
+        base_dir = default_wildcard_dir()
+    with _indexes_lock:
+        index = _indexes.get(base_dir)
+        if index is None:
+            index = _indexes[base_dir] = WildcardIndex(base_dir)
+            wildcard_snapshot.attach(index)
+            if watch_enabled() and not index.start_watcher():
+                logger.warning("[SeedWildcard] SEED_WILDCARD_WATCH is set but watchdog is not installed "
+                               "(or %s does not exist); using mtime checks", base_dir)
+    if refresh:
+        index.refresh()
+    return index
+
+
+def rescan(base_dir=None):
+    """강제 전체 재스캔 진입점."""
+    index = get_index(base_dir, refresh=False)
+    index.rescan()
+    return index
@@ -0,0 +1,205 @@
+import codecs
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+from array import array
+
+from .instrumentation import metrics
+
+# 사이드카 인덱스 저장 위치 (환경변수 SEED_WILDCARD_CACHE_DIR 로 변경 가능)
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+_MAGIC = b"SWLI"
+_VERSION = 2
+# magic, version, byteorder 표시, mtime_ns, size, count  (뒤에 줄마다 (시작, 끝) 오프셋 쌍)
+_HEADER = struct.Struct("=4sIIqQQ")
+_PAIR = struct.Struct("=QQ")
+_BYTEORDER_MARK = 0x01020304
+
+# 인덱스를 만들 때 한 번에 읽는 크기와, 사이드카에 한 번에 쓰는 오프셋 수
+_BLOCK_SIZE = 1 << 20
+_FLUSH_PAIRS = 1 << 16
+
+# ASCII 공백도 아니고, 유니코드 공백(\x85, \xa0, \u1680, \u2000-\u205f, \u3000)의 UTF-8 바이트일 수도 없는 바이트.
+# 줄에 하나라도 있으면 strip() 후에도 비어있지 않으므로 디코딩 없이 판단 가능
+_CONTENT_BYTE = re.compile(rb"[^\t\n\x0b\x0c\r\x1c-\x1f \xc2\xe1-\xe3\x80-\xbf]")
+# \r\n 이 아닌 \r (블록 끝의 \r 은 다음 블록과 합쳐 다시 검사)
+_LONE_CR = re.compile(rb"\r(?!\n)(?!\Z)")
+
+
+class UnsupportedFile(Exception):
+    """줄 오프셋 인덱스로 표현할 수 없는 파일 (단독 '\\r' 줄바꿈, UTF-8 이 아닌 내용 등)."""
+
+
+def cache_dir():
+    return os.environ.get("SEED_WILDCARD_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def sidecar_path(path):
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8", "surrogatepass")).hexdigest()
+    return os.path.join(cache_dir(), "lines", digest + ".lineidx")
+
+
+def _iter_offsets(f, path):
+    """
+    비어있지 않은 줄(strip 기준)의 (시작, 끝) 바이트 오프셋을 차례로 yield 합니다.
+    텍스트 모드 readlines() 와 같은 결과가 되도록 \\n / \\r\\n 만 허용합니다.
+    UTF-8 검사는 블록 단위로 하고, 줄은 공백뿐인지 애매할 때만 디코딩합니다. (메모리는 블록 크기로 고정)
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    content_byte = _CONTENT_BYTE.search
+    carry = b""
+    base = 0  # carry 의 파일 내 시작 위치
+    while True:
+        block = f.read(_BLOCK_SIZE)
+        final = not block
+        try:
+            decoder.decode(block, final)
+        except UnicodeDecodeError:
+            raise UnsupportedFile(path)
+        data = carry + block if carry else block
+        find = data.find
+        if find(b"\r") != -1 and _LONE_CR.search(data):
+            raise UnsupportedFile(path)
+        pos = 0
+        size = len(data)
+        while pos < size:
+            newline = find(b"\n", pos)
+            if newline == -1:
+                if not final:
+                    break
+                newline = end = size
+                if data.endswith(b"\r"):
+                    raise UnsupportedFile(path)
+            else:
+                end = newline - 1 if newline > pos and data[newline - 1] == 13 else newline
+            if end > pos:
+                content = data[pos:end]
+                if content_byte(content) or (not content.isascii() and content.decode("utf-8").strip()):
+                    yield base + pos, base + end
+            pos = newline + 1
+        if final:
+            return
+        carry = data[pos:]
+        base += pos
+
+
+def _write_sidecar(index_path, st, path):
+    """파일을 훑으면서 오프셋을 사이드카에 바로 씁니다 (줄 수와 무관한 메모리). 줄 수를 반환."""
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path), suffix=".tmp")
+    try:
+        count = 0
+        with os.fdopen(fd, "wb") as out, open(path, "rb") as f:
+            out.write(_HEADER.pack(_MAGIC, _VERSION, _BYTEORDER_MARK, st.st_mtime_ns, st.st_size, 0))
+            pending = array("Q")
+            for start, end in _iter_offsets(f, path):
+                pending.append(start)
+                pending.append(end)
+                if len(pending) >= 2 * _FLUSH_PAIRS:
+                    count += len(pending) // 2
+                    pending.tofile(out)
+                    del pending[:]
+            count += len(pending) // 2
+            pending.tofile(out)
+            out.seek(0)
+            out.write(_HEADER.pack(_MAGIC, _VERSION, _BYTEORDER_MARK, st.st_mtime_ns, st.st_size, count))
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return count
+
+
+def _open_sidecar(index_path, st):
+    """유효한 사이드카면 (mmap, count) 를, 아니면 None 을 반환합니다."""
+    try:
+        with open(index_path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            magic, version, mark, mtime_ns, size, count = _HEADER.unpack(header)
+            if (magic, version, mark, mtime_ns, size) != (_MAGIC, _VERSION, _BYTEORDER_MARK,
+                                                        st.st_mtime_ns, st.st_size):
+                return None
+            if count == 0:
+                return None, 0
+            index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    if len(index_map) != _HEADER.size + count * _PAIR.size:
+        index_map.close()
+        return None
+    return index_map, count
+
+
+class MappedLines:
+    """
+    큰 와일드카드 파일의 '비어있지 않은 줄' 을 메모리에 올리지 않고 다루는 시퀀스.
+    줄 오프셋은 디스크의 사이드카 인덱스(mtime/size 로 검증, mmap)에서 읽고,
+    요청된 줄만 파일에서 읽어 디코딩합니다. (len / 인덱싱 O(1), rng.choice 에 그대로 사용 가능)
+    원본 파일은 열어 두지 않습니다: 매핑된 파일이 잘리면 SIGBUS 로 프로세스가 죽고,
+    Windows 에서는 열린 매핑이 편집기의 저장을 막기 때문입니다.
+    파일이 바뀌면 줄 캐시가 다음 조회에서 새로 만들고, 그 사이에 읽은 줄은 잘린 내용일 수 있습니다.
+    """
+
+    def __init__(self, path, st):
+        self.path = path
+        index_path = sidecar_path(path)
+        opened = _open_sidecar(index_path, st)
+        if opened is None:
+            if metrics.enabled:
+                metrics.incr("mmap.index_builds")
+            try:
+                _write_sidecar(index_path, st, path)
+                opened = _open_sidecar(index_path, st)
+            except OSError:
+                opened = None
+            if opened is None:
+                raise UnsupportedFile(path)
+        self._index_map, self._count = opened
+        if metrics.enabled:
+            metrics.incr("mmap.files_opened")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("line index out of range")
+        start, end = _PAIR.unpack_from(self._index_map, _HEADER.size + i * _PAIR.size)
+        with open(self.path, "rb", buffering=0) as f:
+            f.seek(start)
+            data = f.read(end - start)
+        # 읽는 사이 파일이 바뀐 경우에도 예외 없이 (다음 조회에서 줄 캐시가 다시 읽음)
+        return data.decode("utf-8", "replace").strip()
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        mapped = getattr(self, "_index_map", None)
+        if mapped is not None:
+            mapped.close()
+            self._index_map = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self.path)
@@ -0,0 +1,124 @@
+"""
+해석 전에 선택된 줄이 (재귀적으로) 참조하는 와일드카드 파일을 한 번에 병렬로 읽어 두는 선행 로딩.
+
+해석 중에는 태그를 만날 때마다 파일을 하나씩 동기적으로 읽기 때문에, 느린 네트워크 드라이브에서는
+첫 조회마다 큐 전체가 멈춥니다. 여기서는 참조를 단계별(BFS)로 끝까지 따라가며 캐시에 없거나
+(mtime/size 가 바뀌어) 오래된 파일만 제한된 스레드 풀에서 동시에 읽어 line_cache 에 채워 둡니다.
+파일별 태그 목록은 signature 와 함께 기억하므로, 이미 읽어 둔 라이브러리에서는 파일마다 stat 한 번으로 끝납니다.
+(최선의 노력: 실패한 파일은 해석 단계에서 평소처럼 읽고 오류를 보고합니다.)
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrumentation import metrics
+from .wildcard_cache import line_cache
+from .wildcard_graph import TAG_MODES
+
+# 동시에 읽는 파일 수. 환경변수 SEED_WILDCARD_PREFETCH_THREADS 로 조정 (0 = 선행 로딩 안 함)
+DEFAULT_PREFETCH_THREADS = 8
+# 한 번의 선행 로딩에서 따라가는 최대 파일 수 (허브 파일이 라이브러리 전체를 끌어오지 않도록)
+DEFAULT_MAX_FILES = 256
+
+_pool = None
+_pool_lock = threading.Lock()
+_refs = {}  # (path, 태그 정규식) -> (signature, 줄에 적힌 태그들)
+
+
+def _threads_from_env():
+    try:
+        return max(0, int(os.environ.get("SEED_WILDCARD_PREFETCH_THREADS", DEFAULT_PREFETCH_THREADS)))
+    except ValueError:
+        return DEFAULT_PREFETCH_THREADS
+
+
+prefetch_threads = _threads_from_env()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=prefetch_threads, thread_name_prefix="seed-wildcard-prefetch")
+        return _pool
+
+
+def _load(path):
+    try:
+        line_cache.get_lines(path)
+    except Exception:
+        pass  # 해석 단계에서 다시 읽으며 오류를 보고함
+
+
+def _needs_load(path):
+    """캐시에 없거나 캐시된 내용이 현재 파일과 다르면 True (peek 은 오래된 항목도 돌려주므로 stat 으로 확인)."""
+    entry = line_cache.peek(path)
+    if entry is None:
+        return True
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False  # 해석 단계에서 읽으며 오류를 보고함
+    return tuple(entry[0]) != (st.st_mtime_ns, st.st_size)
+
+
+def _tags_in(path, tag_re):
+    entry = line_cache.peek(path)
+    if entry is None:
+        return ()
+    signature, lines = entry
+    if not isinstance(lines, tuple):
+        return ()  # mmap 으로 다루는 큰 파일은 전체를 훑지 않음
+    key = (path, tag_re)
+    cached = _refs.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    tags = set()
+    for line in lines:
+        if "__" in line:
+            tags.update(tag_re.findall(line))
+    tags = tuple(tags)
+    _refs[key] = (signature, tags)
+    return tags
+
+
+def prefetch(texts, tag_map, mode="impact", max_files=DEFAULT_MAX_FILES):
+    """
+    texts 에 적힌 태그가 가리키는 파일과 그 파일들이 다시 참조하는 파일을 단계별로 병렬 로딩합니다.
+    한 단계의 파일들은 하나의 묶음으로 동시에 읽힙니다. 새로 읽은 파일 수를 반환합니다.
+    """
+    if prefetch_threads <= 0:
+        return 0
+    tag_re, tag_key, _ = TAG_MODES[mode]
+    tags = set()
+    for text in texts:
+        if "__" in text:
+            tags.update(tag_re.findall(text))
+
+    seen = set()
+    loaded = 0
+    with metrics.phase("prefetch"):
+        while tags and len(seen) < max_files:
+            frontier = []
+            for tag in tags:
+                path = tag_map.get(tag_key(tag))
+                if path is not None and path not in seen:
+                    if len(seen) >= max_files:
+                        break
+                    seen.add(path)
+                    frontier.append(path)
+            if not frontier:
+                break
+            missing = [path for path in frontier if _needs_load(path)]
+            if len(missing) == 1:
+                _load(missing[0])
+            elif missing:
+                list(_get_pool().map(_load, missing))
+            loaded += len(missing)
+
+            tags = set()
+            for path in frontier:
+                tags.update(_tags_in(path, tag_re))
+    if loaded and metrics.enabled:
+        metrics.incr("prefetch.files_loaded", loaded)
+    return loaded
@@ -0,0 +1,229 @@
+"""
+와일드카드 라이브러리의 디스크 스냅샷.
+
+ComfyUI 를 다시 시작할 때마다 폴더 전체를 스캔하고 파일을 읽고 템플릿을 파싱하는 대신,
+직전 실행의 상태를 한 파일로 저장해 두었다가 첫 사용 시 한 번에 불러옵니다.
+- 폴더 인덱스: 폴더별 (mtime_ns, txt 파일명, 하위 폴더) -> 다음 refresh() 에서 폴더 mtime 으로 검증
+- 줄 캐시: 파일별 ((mtime_ns, size), 줄 목록) -> get_lines() 에서 파일 stat 으로 검증
+- 컴파일된 템플릿: 텍스트에만 의존하므로 형식 버전이 같으면 그대로 사용
+  (저장하는 줄 캐시에 들어있는 줄의 템플릿만. 시드마다 바뀌는 템플릿은 다음 실행에 도움이 되지 않음)
+(큰 파일의 줄 오프셋은 wildcard_mmap 의 사이드카 인덱스가 이미 디스크에 유지합니다.)
+
+저장은 프로세스 종료 시(atexit) 외에도, 해석으로 캐시 내용이 바뀌면 잠시 뒤(SEED_WILDCARD_SNAPSHOT_DELAY 초)에
+백그라운드에서 한 번 합니다. (SIGTERM/kill 로 종료되면 atexit 가 실행되지 않으므로)
+
+형식: 헤더(magic, 형식 버전, marshal 버전, 파이썬 버전) + zlib(marshal(payload)).
+버전이 하나라도 다르거나 내용이 손상되었으면 조용히 무시하고 평소처럼 스캔합니다.
+"""
+import atexit
+import hashlib
+import marshal
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+
+from .instrumentation import logger, metrics
+from .wildcard_cache import line_cache
+from .wildcard_template import decode_template, encode_template, template_cache
+
+# Template/인덱스 구조가 바뀌면 올려서 이전 스냅샷을 무효화
+SNAPSHOT_VERSION = 1
+_MAGIC = b"SWSN"
+# magic, 형식 버전, marshal 버전, 파이썬 버전(major * 100 + minor)
+_HEADER = struct.Struct("=4sIII")
+_PYTHON_VERSION = sys.version_info[0] * 100 + sys.version_info[1]
+
+# 캐시 내용이 바뀐 뒤 저장하기까지 기다리는 시간 (초). 연속 실행을 한 번의 저장으로 묶음 (0 = 종료 시에만 저장)
+DEFAULT_SAVE_DELAY = 30
+
+_lock = threading.Lock()
+_saved_state = {}  # base_dir -> 마지막으로 저장/복원한 시점의 (generation, 줄 캐시 version, 줄 템플릿 수)
+_attached = {}     # base_dir -> WildcardIndex
+_checked_state = {}  # base_dir -> schedule_save 가 마지막으로 본 (generation, 줄 캐시 version, 템플릿 캐시 크기)
+_pending = {}        # base_dir -> 예약된 저장 타이머
+
+
+def snapshot_enabled():
+    """환경변수 SEED_WILDCARD_SNAPSHOT=0 이면 스냅샷을 읽지도 쓰지도 않습니다."""
+    return os.environ.get("SEED_WILDCARD_SNAPSHOT", "1").lower() not in ("0", "false", "no", "off")
+
+
+def _delay_from_env():
+    try:
+        return max(0.0, float(os.environ.get("SEED_WILDCARD_SNAPSHOT_DELAY", DEFAULT_SAVE_DELAY)))
+    except ValueError:
+        return DEFAULT_SAVE_DELAY
+
+
+save_delay = _delay_from_env()
+
+
+def snapshot_path(base_dir):
+    """
+    기본 위치는 wildcards 폴더 옆의 숨김 파일 (예: ComfyUI-Impact-Pack/.wildcards.seedwildcard.snap).
+    SEED_WILDCARD_CACHE_DIR 가 지정되어 있으면 그 아래 snapshots/ 폴더를 사용합니다.
+    """
+    base_dir = os.path.abspath(base_dir)
+    cache_dir = os.environ.get("SEED_WILDCARD_CACHE_DIR")
+    if cache_dir:
+        digest = hashlib.sha1(base_dir.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(cache_dir, "snapshots", digest + ".snap")
+    parent, name = os.path.split(base_dir.rstrip(os.sep))
+    return os.path.join(parent, f".{name}.seedwildcard.snap")
+
+
+def _contents(index):
+    """저장할 (줄 캐시 항목, 템플릿). 템플릿은 텍스트가 저장되는 줄 중 하나인 것만 고릅니다."""
+    lines = line_cache.export(os.path.join(index.base_dir, ""))
+    texts = set()
+    for _, _, file_lines in lines:
+        texts.update(file_lines)
+    templates = [(tag_re, template) for text, tag_re, template in template_cache.items() if text in texts]
+    return lines, templates
+
+
+def _state(index, contents):
+    return index.generation, line_cache.version, len(contents[1])
+
+
+def _encode(index, dirs, contents):
+    lines, templates = contents
+    payload = {
+        "base_dir": index.base_dir,
+        "dirs": dirs,
+        "lines": lines,
+        "templates": [(tag_re.pattern, tag_re.flags, encode_template(template)) for tag_re, template in templates],
+    }
+    header = _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, marshal.version, _PYTHON_VERSION)
+    return header + zlib.compress(marshal.dumps(payload), 1)
+
+
+def _decode(data):
+    if len(data) < _HEADER.size:
+        return None
+    if _HEADER.unpack_from(data) != (_MAGIC, SNAPSHOT_VERSION, marshal.version, _PYTHON_VERSION):
+        return None
+    return marshal.loads(zlib.decompress(data[_HEADER.size:]))
+
+
+def restore(index):
+    """스냅샷이 있으면 인덱스/줄 캐시/템플릿 캐시를 채웁니다. 성공하면 True."""
+    path = snapshot_path(index.base_dir)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return False
+
+    with metrics.phase("snapshot.restore"):
+        try:
+            payload = _decode(data)
+            if payload is None or payload.get("base_dir") != index.base_dir:
+                return False
+            if not index.restore(payload["dirs"]):
+                return False
+            line_cache.preload(payload["lines"])
+            templates = []
+            for pattern, flags, encoded in payload["templates"]:
+                tag_re = re.compile(pattern, flags)
+                templates.append((encoded[0], tag_re, decode_template(encoded, tag_re)))
+            template_cache.preload(templates)
+        except Exception as e:
+            # 손상되었거나 다른 형식의 스냅샷: 무시하고 평소처럼 스캔
+            logger.debug("ignoring wildcard snapshot %s: %s", path, e)
+            return False
+    if metrics.enabled:
+        metrics.incr("snapshot.restored")
+    return True
+
+
+def save(index, force=False):
+    """마지막 저장/복원 이후 바뀐 내용이 있으면 스냅샷을 원자적으로 다시 씁니다. 썼으면 True."""
+    with _lock:
+        contents = _contents(index)
+        state = _state(index, contents)
+        if not force and _saved_state.get(index.base_dir) == state:
+            return False
+        dirs = index.export_state()
+        if dirs is None or not os.path.isdir(index.base_dir):
+            return False
+        path = snapshot_path(index.base_dir)
+        try:
+            data = _encode(index, dirs, contents)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except (OSError, ValueError) as e:
+            logger.warning("could not write wildcard snapshot %s: %s", path, e)
+            return False
+        _saved_state[index.base_dir] = state
+    if metrics.enabled:
+        metrics.incr("snapshot.saved")
+    return True
+
+
+def save_all():
+    """attach() 된 모든 인덱스의 스냅샷을 저장합니다. (프로세스 종료 시 자동 호출)"""
+    for index in list(_attached.values()):
+        save(index)
+
+
+def _quick_state(index):
+    # _contents() 를 만들지 않고 비교할 수 있는 값 (해석마다 호출되므로)
+    return index.generation, line_cache.version, len(template_cache)
+
+
+def schedule_save(index):
+    """
+    attach() 된 인덱스의 캐시 내용이 마지막 확인 이후 바뀌었으면 save_delay 초 뒤에 저장을 예약합니다.
+    이미 예약되어 있으면 아무것도 하지 않습니다. (첫 워밍업 직후와, 이후 내용이 바뀔 때마다 저장됨)
+    """
+    base_dir = index.base_dir
+    if save_delay <= 0 or base_dir not in _attached or base_dir in _pending:
+        return False
+    if _checked_state.get(base_dir) == _quick_state(index):
+        return False
+    with _lock:
+        if base_dir in _pending:
+            return False
+        timer = _pending[base_dir] = threading.Timer(save_delay, _scheduled_save, (index,))
+        timer.daemon = True
+        timer.start()
+    return True
+
+
+def _scheduled_save(index):
+    with _lock:
+        _pending.pop(index.base_dir, None)
+        _checked_state[index.base_dir] = _quick_state(index)
+    try:
+        save(index)
+    except Exception as e:
+        logger.warning("could not write wildcard snapshot for %s: %s", index.base_dir, e)
+
+
+def attach(index):
+    """새로 만든 프로세스 전역 인덱스에 스냅샷을 불러오고, 종료 시(와 schedule_save 로) 저장되도록 등록합니다."""
+    if not snapshot_enabled():
+        return False
+    restored = restore(index)
+    with _lock:
+        if not _attached:
+            atexit.register(save_all)
+        _attached[index.base_dir] = index
+        _saved_state[index.base_dir] = _state(index, _contents(index))
+        _checked_state[index.base_dir] = _quick_state(index)
+    return restored
@@ -0,0 +1,501 @@
+import math
+import re
+import threading
+from bisect import bisect, bisect_right
+from collections import OrderedDict
+from itertools import accumulate
+
+from .instrumentation import metrics
+
+# 기존 resolve_wildcards 와 같은 최대 재귀 깊이 (depth > 20 이면 중단)
+MAX_DEPTH = 20
+
+# 태그 정규표현식: 점(.)과 슬래시(/, \) 포함 인식 (SeedBasedWildcardImpact)
+TAG_PATTERN = re.compile(r'__([\w\-\s./\\]+)__')
+# 경로를 허용하지 않는 태그 (SeedBasedWildcardLora)
+SIMPLE_TAG_PATTERN = re.compile(r'__([\w\-\s]+)__')
+
+_BRACE_RE = re.compile(r'[{}]')
+
+# 샘플링 방식
+# - compatible: random.choices / random.choice 와 같은 난수 소비 (기존 결과와 동일)
+# - alias: 가중치 그룹은 alias table 로 O(1), 파일 줄 선택은 random() 한 번으로 O(1)
+SAMPLING_MODES = ["compatible", "alias"]
+
+
+def parse_segment(segment):
+    """'weight::value' 구문을 (weight, value) 로 나눕니다. (기존 로직과 동일한 예외 처리)"""
+    if '::' in segment:
+        try:
+            weight_str, val = segment.split('::', 1)
+            weight = float(weight_str)
+        except ValueError:
+            weight = 1.0
+            val = segment
+    else:
+        weight = 1.0
+        val = segment
+    return weight, val
+
+
+def _valid_total(cum_weights):
+    # random.choices 와 같은 검사: 합이 0 이하이거나 유한하지 않으면 None
+    total = cum_weights[-1] + 0.0
+    if total <= 0.0 or not math.isfinite(total):
+        return None
+    return total
+
+
+def _choose(rng, values, cum_weights, total):
+    # random.choices(values, cum_weights=...) 와 동일한 난수 소비 (리스트 할당 없음)
+    # 가중치 합이 잘못된 경우 첫 번째 값, 난수 소비 없음 (기존 ValueError 처리와 동일)
+    if total is None:
+        return values[0] if values else ""
+    return values[bisect(cum_weights, rng.random() * total, 0, len(values) - 1)]
+
+
+def build_alias_table(weights):
+    """Vose 의 alias method. (prob, alias) 를 반환하며 음수 가중치는 0 으로 취급합니다."""
+    n = len(weights)
+    weights = [w if w > 0.0 else 0.0 for w in weights]
+    total = math.fsum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] = (scaled[more] + scaled[less]) - 1.0
+        (small if scaled[more] < 1.0 else large).append(more)
+    return prob, alias
+
+
+def pick_line(rng, lines, alias=False):
+    """파일 줄 하나를 균등하게 선택합니다. (alias=False 면 rng.choice 와 동일)"""
+    if not alias:
+        return rng.choice(lines)
+    n = len(lines)
+    return lines[min(int(rng.random() * n), n - 1)]
+
+
+class Choice:
+    """
+    {a|b|w::c} 그룹 노드.
+    - 모든 선택지가 리터럴이면 값과 누적 가중치를 미리 계산해 둡니다.
+    - 중첩 그룹이 있으면 자식을 먼저 평가한 뒤(기존 '가장 안쪽부터' 순서와 동일) 가중치를 해석합니다.
+    """
+    __slots__ = ('segments', 'values', 'weights', 'cum_weights', 'total', 'alias_ok', '_alias')
+
+    def __init__(self, segments):
+        self.segments = segments  # 선택지별 item tuple (str 또는 Choice)
+        self._alias = None
+        if all(len(seg) <= 1 and not (seg and isinstance(seg[0], Choice)) for seg in segments):
+            parsed = [parse_segment(seg[0] if seg else "") for seg in segments]
+            self.values = [val for _, val in parsed]
+            self.weights = [weight for weight, _ in parsed]
+            self.cum_weights = list(accumulate(self.weights))
+            self.total = _valid_total(self.cum_weights)
+            # 음수 가중치가 있으면 alias table 로는 bisect 와 같은 분포를 낼 수 없으므로 누적 가중치 사용
+            self.alias_ok = self.total is not None and all(w >= 0.0 for w in self.weights)
+        else:
+            self.values = None
+            self.weights = None
+            self.cum_weights = None
+            self.total = None
+            self.alias_ok = False
+
+    def _sample_alias(self, rng):
+        if self._alias is None:
+            self._alias = build_alias_table(self.weights)
+        prob, alias = self._alias
+        n = len(prob)
+        # random() 한 번으로 칸(i)과 칸 내부 위치(u - i)를 모두 얻음
+        u = rng.random() * n
+        i = min(int(u), n - 1)
+        return self.values[i if u - i < prob[i] else alias[i]]
+
+    def evaluate(self, rng, alias=False):
+        """(결과 문자열, blocked) 를 반환. blocked 이면 중괄호가 남아 상위 그룹도 해석되지 않습니다."""
+        if self.values is not None:
+            if alias and self.alias_ok:
+                return self._sample_alias(rng), False
+            return _choose(rng, self.values, self.cum_weights, self.total), False
+
+        texts = []
+        blocked = False
+        for seg in self.segments:
+            parts = []
+            for item in seg:
+                if isinstance(item, Choice):
+                    text, child_blocked = item.evaluate(rng, alias)
+                    blocked = blocked or child_blocked
+                    parts.append(text)
+                else:
+                    parts.append(item)
+            texts.append("".join(parts))
+        content = "|".join(texts)
+        # 자식 결과가 중괄호를 남겼거나 내용이 비면 기존 정규식({[^{}]+})에 매칭되지 않음
+        if blocked or not content:
+            return "{" + content + "}", True
+
+        # 중첩 그룹은 가중치가 실행 때마다 달라질 수 있으므로 누적 가중치 + bisect 사용
+        parsed = [parse_segment(text) for text in texts]
+        values = [val for _, val in parsed]
+        cum_weights = list(accumulate(weight for weight, _ in parsed))
+        return _choose(rng, values, cum_weights, _valid_total(cum_weights)), False
+
+
+class Template:
+    """
+    한 줄을 한 번만 파싱한 결과.
+    - items: 리터럴(str)과 Choice 노드의 tuple
+    - tags: 그룹이 없는 텍스트일 때 미리 찾아 둔 태그 위치 (start, end, tag)
+    - open_brace: 짝이 없는 '{' 가 남아 뒤에 이어 붙는 텍스트의 '}' 와 그룹을 만들 수 있으면 True
+    """
+    __slots__ = ('text', 'items', 'has_choices', 'tags', 'open_brace')
+
+    def __init__(self, text, items, tag_re, tags=None):
+        self.text = text
+        self.items = items
+        self.has_choices = any(isinstance(item, Choice) for item in items)
+        if self.has_choices:
+            self.tags = None
+        elif tags is not None:
+            self.tags = tags
+        else:
+            self.tags = tuple((m.start(), m.end(), m.group(1)) for m in tag_re.finditer(text))
+        self.open_brace = _has_open_brace(text)
+
+    def render_choices(self, rng, alias=False):
+        parts = []
+        for item in self.items:
+            if isinstance(item, Choice):
+                parts.append(item.evaluate(rng, alias)[0])
+            else:
+                parts.append(item)
+        return "".join(parts)
+
+
+def _has_open_brace(text):
+    if "{" not in text:
+        return False
+    depth = 0
+    for m in _BRACE_RE.finditer(text):
+        if text[m.start()] == '{':
+            depth += 1
+        elif depth:
+            depth -= 1
+    return depth > 0
+
+
+def _merge_literals(items):
+    merged = []
+    for item in items:
+        if isinstance(item, str):
+            if not item:
+                continue
+            if merged and isinstance(merged[-1], str):
+                merged[-1] += item
+                continue
+        merged.append(item)
+    return merged
+
+
+def _parse_items(text):
+    # 짝이 맞는 중괄호만 그룹으로 인식하고, 짝이 없는 중괄호는 리터럴로 둡니다.
+    pairs = {}
+    stack = []
+    for m in _BRACE_RE.finditer(text):
+        pos = m.start()
+        if text[pos] == '{':
+            stack.append(pos)
+        elif stack:
+            pairs[stack.pop()] = pos
+    if not pairs:
+        return [text] if text else []
+
+    def build(start, end):
+        """text[start:end] 를 (items, blocked) 로 변환."""
+        items = []
+        blocked = False
+        pos = start
+        while pos < end:
+            open_pos = text.find('{', pos, end)
+            while open_pos != -1 and open_pos not in pairs:
+                open_pos = text.find('{', open_pos + 1, end)
+            if open_pos == -1:
+                items.append(text[pos:end])
+                break
+            close_pos = pairs[open_pos]
+            items.append(text[pos:open_pos])
+            if close_pos == open_pos + 1:
+                # 빈 그룹 {} 은 리터럴로 남고, 이를 포함한 상위 그룹도 해석되지 않음
+                items.append("{}")
+                blocked = True
+            else:
+                child_items, child_blocked = build(open_pos + 1, close_pos)
+                if child_blocked:
+                    items.append("{")
+                    items.extend(child_items)
+                    items.append("}")
+                    blocked = True
+                else:
+                    items.append(_make_choice(child_items))
+            pos = close_pos + 1
+        return _merge_literals(items), blocked
+
+    return build(0, len(text))[0]
+
+
+def _make_choice(items):
+    segments = []
+    current = []
+    for item in items:
+        if isinstance(item, str):
+            pieces = item.split('|')
+            current.append(pieces[0])
+            for piece in pieces[1:]:
+                segments.append(tuple(_merge_literals(current)))
+                current = [piece]
+        else:
+            current.append(item)
+    segments.append(tuple(_merge_literals(current)))
+    return Choice(segments)
+
+
+def _encode_items(items):
+    return tuple(item if isinstance(item, str) else tuple(_encode_items(seg) for seg in item.segments)
+                 for item in items)
+
+
+def _decode_items(data):
+    return tuple(item if isinstance(item, str) else Choice(tuple(_decode_items(seg) for seg in item))
+                 for item in data)
+
+
+def encode_template(template):
+    """Template 을 기본 타입(str/tuple)만으로 된 값으로 변환합니다. (스냅샷 저장용)"""
+    return template.text, _encode_items(template.items), template.tags
+
+
+def decode_template(data, tag_re=TAG_PATTERN):
+    text, items, tags = data
+    return Template(text, _decode_items(items), tag_re, tags)
+
+
+class TemplateCache:
+    """
+    (텍스트, 태그 정규식) -> Template 의 LRU 캐시.
+    functools.lru_cache 와 달리 내용을 열람/미리 채울 수 있어 디스크 스냅샷에 사용됩니다.
+    """
+
+    def __init__(self, maxsize=8192, metric="template.compiled"):
+        self.maxsize = maxsize
+        self.metric = metric
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.version = 0  # 새로 컴파일한 항목이 생길 때마다 증가
+
+    def get(self, text, tag_re):
+        key = (text, tag_re)
+        template = self._entries.get(key)
+        if template is not None:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                pass  # 다른 스레드가 방금 제거함
+            return template
+        if metrics.enabled:
+            metrics.incr(self.metric)
+        template = Template(text, tuple(_parse_items(text)), tag_re)
+        self._put(key, template)
+        self.version += 1
+        return template
+
+    def _put(self, key, template):
+        with self._lock:
+            self._entries[key] = template
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def items(self):
+        """오래된 것부터 (text, tag_re, template) 목록."""
+        with self._lock:
+            return [(text, tag_re, template) for (text, tag_re), template in self._entries.items()]
+
+    def preload(self, entries):
+        """(text, tag_re, template) 들을 캐시에 없는 경우에만 추가합니다. (version 은 바꾸지 않음)"""
+        for text, tag_re, template in entries:
+            if (text, tag_re) not in self._entries:
+                self._put((text, tag_re), template)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 파일 줄의 템플릿 (스냅샷에 저장됨)
+template_cache = TemplateCache()
+# 해석 도중에 생기는 중간 텍스트 (선택 결과, 태그 치환 결과). 시드마다 달라 대부분 한 번만 쓰이므로
+# 파일 줄의 템플릿을 밀어내지 않도록 작은 별도 캐시에 둡니다.
+scratch_cache = TemplateCache(maxsize=1024, metric="template.scratch_compiled")
+
+
+def compile_template(text, tag_re=TAG_PATTERN):
+    """파일 줄을 Template 으로 컴파일 (같은 텍스트는 캐시된 결과를 재사용)."""
+    return template_cache.get(text, tag_re)
+
+
+def _render_pieces(pieces, rng, alias, tag_re):
+    """
+    조각들의 {} 그룹을 선택한 (텍스트 목록, 그룹이 있었는지). 조각 하나만 템플릿이 있으면 그 템플릿도 반환.
+    파일 줄 조각은 template_cache, 나머지는 scratch_cache 에서 컴파일합니다.
+    앞 조각에 짝이 없는 '{' 가 있어 조각 경계에서 새 그룹이 생길 수 있으면 None (전체를 한 번에 파싱해야 함).
+    """
+    templates = []
+    last = len(pieces) - 1
+    for i, (piece, is_line) in enumerate(pieces):
+        if "{" not in piece:
+            templates.append(None)
+            continue
+        template = (template_cache if is_line else scratch_cache).get(piece, tag_re)
+        if template.open_brace and i < last:
+            return None
+        templates.append(template)
+    texts = []
+    had_choices = False
+    for (piece, _), template in zip(pieces, templates):
+        if template is not None and template.has_choices:
+            had_choices = True
+            texts.append(template.render_choices(rng, alias))
+        else:
+            texts.append(piece)
+    return texts, had_choices, templates[0] if last == 0 else None
+
+
+def _span_chain(ends, chains, start, end):
+    """[start, end) 구간이 걸친 조각들의 경로 합집합. ends[i] 는 i 번째 조각의 끝 위치."""
+    i = bisect_right(ends, start)
+    chain = chains[i]
+    while ends[i] < end:
+        i += 1
+        chain = chain | chains[i]
+    return chain
+
+
+def _append_fragment(pieces, piece_chains, ends, chains, text, start, end):
+    """text[start:end] 를 조각 경계에서 나눠 각자의 경로와 함께 추가합니다."""
+    i = bisect_right(ends, start)
+    while start < end:
+        stop = min(ends[i], end)
+        pieces.append((text[start:stop], False))
+        piece_chains.append(chains[i])
+        start = stop
+        i += 1
+
+
+def resolve(text, rng, lookup, tag_re=TAG_PATTERN, depth=0, sampling="compatible", origin=None):
+    """
+    와일드카드 구문을 해석합니다. lookup(tag) 는 태그에 해당하는 줄 목록(없으면 빈 값)을 반환해야 합니다.
+    sampling="compatible" 이면 기존 문자열 치환 방식과 난수 소비 순서가 같아, 같은 시드에서 결과가 바이트 단위로 동일합니다.
+    sampling="alias" 는 더 빠르지만 (시드별로 결정적이긴 해도) 다른 선택 결과를 냅니다.
+    (한 단계 = 모든 {} 그룹을 안쪽/왼쪽부터 선택 -> 모든 __tag__ 치환, 변화가 없으면 종료)
+
+    텍스트는 (조각, 파일 줄인지) 목록으로 들고 다닙니다. 태그로 삽입된 줄은 파일 줄의 템플릿(가중치 그룹과
+    alias table 포함)을 그대로 재사용하고, 조각 경계에서 새 그룹이 생길 수 있을 때만 합친 텍스트를 다시 파싱합니다.
+    태그는 경계에 걸쳐 생길 수 있으므로 그룹을 선택한 뒤 합친 텍스트에서 찾습니다.
+
+    origin (frozenset) 을 주면 조각마다 '지금까지 거쳐 온 파일들' 을 함께 들고 다니며 lookup(tag, chain) 으로
+    조회합니다. lookup 은 (줄 목록, 삽입된 줄의 chain) 을 반환하고, 경로에 이미 있는 파일로 다시 들어가는 태그에는
+    빈 값을 돌려 리터럴로 남길 수 있습니다 (순환 끊기). 조각을 합쳐 다시 파싱하는 드문 경우에는 경로를 합칩니다.
+    """
+    alias = sampling == "alias"
+    track = origin is not None
+    # 처음 받은 text 는 파일 줄
+    pieces = ((text, True),)
+    chains = [origin]
+    while depth <= MAX_DEPTH:
+        if len(pieces) == 1 and "{" not in text and "__" not in text:
+            # 그룹도 태그도 없으면 이번 단계는 변화가 없음 (잎 파일의 줄만 남은 경우 컴파일 생략)
+            resolved = text
+            break
+        rendered = _render_pieces(pieces, rng, alias, tag_re)
+        if rendered is None:
+            pieces = ((text, False),)
+            if track:
+                chains = [frozenset().union(*chains)]
+            rendered = _render_pieces(pieces, rng, alias, tag_re)
+        texts, had_choices, template = rendered
+
+        resolved = texts[0] if len(texts) == 1 else "".join(texts)
+        if template is not None and not had_choices:
+            tags = template.tags
+        elif "__" in resolved:
+            tags = [(m.start(), m.end(), m.group(1)) for m in tag_re.finditer(resolved)]
+        else:
+            tags = ()
+        replaced = False
+        next_pieces = []
+        next_chains = []
+        if tags:
+            last = 0
+            if track:
+                ends = list(accumulate(map(len, texts)))
+            if metrics.enabled:
+                metrics.incr("wildcard.tag_lookups", len(tags))
+            for start, end, tag in tags:
+                if track:
+                    lines, inserted_chain = lookup(tag, _span_chain(ends, chains, start, end))
+                else:
+                    lines = lookup(tag)
+                if lines:
+                    choice = pick_line(rng, lines, alias)
+                    if choice != resolved[start:end]:
+                        replaced = True
+                    if start > last:
+                        if track:
+                            _append_fragment(next_pieces, next_chains, ends, chains, resolved, last, start)
+                        else:
+                            next_pieces.append((resolved[last:start], False))
+                    if choice:
+                        next_pieces.append((choice, True))
+                        if track:
+                            next_chains.append(inserted_chain)
+                    last = end
+            if last:
+                if last < len(resolved):
+                    if track:
+                        _append_fragment(next_pieces, next_chains, ends, chains, resolved, last, len(resolved))
+                    else:
+                        next_pieces.append((resolved[last:], False))
+                resolved = "".join(piece for piece, _ in next_pieces)
+
+        # {} 선택 후 태그 치환으로 원래 텍스트가 다시 만들어질 수 있으므로 그 경우만 전체 비교
+        changed = resolved != text if had_choices else replaced
+        if not changed:
+            break
+        text = resolved
+        if next_pieces:
+            pieces = next_pieces
+            chains = next_chains
+        elif track:
+            # 치환 없이 그룹만 선택된 경우: 조각별 경로를 유지
+            pieces = [(piece, False) for piece in texts]
+        else:
+            pieces = ((resolved, False),)
+        depth += 1
+    else:
+        resolved = text
+    if metrics.enabled:
+        # 도달한 재귀 깊이 (MAX_DEPTH 를 넘으면 반쯤 해석된 텍스트가 반환된 것)
+        metrics.observe_max("wildcard.max_depth", depth)
+        if depth > MAX_DEPTH:
+            metrics.incr("wildcard.depth_limit_hits")
+    return resolved
@@ -0,0 +1,151 @@
+"""
+중복 없는 프롬프트 샘플링.
+
+작은 와일드카드 파일에서는 여러 시드가 같은 프롬프트를 만들기 쉽습니다.
+UniqueFilter 는 이미 내보낸 확장 결과를 Bloom filter 에 기록하고, 중복이면 같은 시드의 대체 시도
+(attempt k: 줄 (seed - 1 + k) % n, 난수 시드 seed + k * 2^64) 를 순서대로 시도해 처음 보는 결과를 고릅니다.
+attempt 0 은 일반 모드와 같은 결과이고, 같은 입력 순서면 결과도 항상 같습니다.
+메모리는 capacity 로 고정되며 (기본 100만 개 ~ 2.4MB), 넘치면 오탐률만 올라갑니다.
+세션 필터는 최근에 쓴 SEED_WILDCARD_UNIQUE_SESSIONS 개(기본 8)까지만 유지하고,
+POST /seed_wildcard/unique/reset 으로 모두 지울 수 있습니다.
+"""
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from .instrumentation import metrics
+
+UNIQUE_MODES = ["off", "session"]
+BATCH_UNIQUE_MODES = ["off", "run", "session"]
+
+DEFAULT_CAPACITY = 1000000
+DEFAULT_MAX_ATTEMPTS = 64
+DEFAULT_SESSIONS = 8
+ERROR_RATE = 1e-4
+
+_MASK64 = (1 << 64) - 1
+
+
+def _int_from_env(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+max_capacity = _int_from_env("SEED_WILDCARD_UNIQUE_CAPACITY", DEFAULT_CAPACITY)
+max_sessions = _int_from_env("SEED_WILDCARD_UNIQUE_SESSIONS", DEFAULT_SESSIONS)
+
+
+class BloomFilter:
+    """고정 크기 비트 배열. add() 는 처음 보는 값이면 True (오탐 시 드물게 False)."""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, text):
+        digest = int.from_bytes(
+            hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), "little")
+        # double hashing: 위치 i = h1 + i * h2
+        h1, h2 = digest & _MASK64, (digest >> 64) | 1
+        bits, size = self.bits, self.size
+        new = False
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        return new
+
+
+class UniqueFilter:
+    """
+    내보낸 확장 결과의 집합 (한 실행 또는 세션 단위).
+    checked / duplicates / exhausted 로 중복률을 알 수 있고, 계측이 켜져 있으면 unique.* 카운터로도 보고합니다.
+    """
+
+    def __init__(self, capacity=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        capacity = max_capacity if capacity is None else min(capacity, max_capacity)
+        self.bloom = BloomFilter(capacity)
+        self.max_attempts = max_attempts
+        self.checked = 0
+        self.duplicates = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def duplicate_rate(self):
+        """첫 시도가 이미 나온 결과였던 비율."""
+        return self.duplicates / self.checked if self.checked else 0.0
+
+    def check(self, text):
+        """처음 보는 결과면 기록하고 True, 이미 나온 결과면 False."""
+        with self._lock:
+            self.checked += 1
+            new = self.bloom.add(text)
+            if not new:
+                self.duplicates += 1
+        if metrics.enabled:
+            metrics.incr("unique.checked")
+            if not new:
+                metrics.incr("unique.duplicates")
+        return new
+
+    def retry(self, candidates, key=None):
+        """대체 시도들 중 처음 보는 결과를 기록하고 반환. 모두 중복이면 None. (key: 후보 -> 비교할 문자열)"""
+        for candidate in candidates:
+            with self._lock:
+                new = self.bloom.add(candidate if key is None else key(candidate))
+            if new:
+                return candidate
+        with self._lock:
+            self.exhausted += 1
+        if metrics.enabled:
+            metrics.incr("unique.exhausted")
+        return None
+
+    def pick(self, expand, seed):
+        """expand(seed, attempt) 로 처음 보는 결과를 고릅니다. max_attempts 안에 없으면 attempt 0 결과."""
+        text = expand(seed)
+        if self.check(text):
+            return text
+        alternative = self.retry(expand(seed, attempt) for attempt in range(1, self.max_attempts))
+        return text if alternative is None else alternative
+
+    def summary(self):
+        return (f"{self.duplicates} of {self.checked} first picks were duplicates "
+                f"({self.duplicate_rate:.1%}), {self.exhausted} without an unseen alternative")
+
+
+_session_filters = OrderedDict()
+_session_lock = threading.Lock()
+
+
+def session_filter(key):
+    """
+    key(노드 종류, 폴더, 태그 규칙, 파일) 별로 ComfyUI 가 재시작될 때까지 유지되는 필터.
+    max_sessions 개를 넘으면 가장 오래 쓰지 않은 필터부터 버립니다 (그 파일은 처음부터 다시 기록).
+    """
+    with _session_lock:
+        unique = _session_filters.get(key)
+        if unique is None:
+            unique = _session_filters[key] = UniqueFilter()
+            while len(_session_filters) > max_sessions:
+                _session_filters.popitem(last=False)
+        else:
+            _session_filters.move_to_end(key)
+    return unique
+
+
+def reset_sessions():
+    """모든 세션 필터를 지웁니다. 지운 필터 수를 반환."""
+    with _session_lock:
+        cleared = len(_session_filters)
+        _session_filters.clear()
+    return cleared